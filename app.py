@@ -15,8 +15,25 @@ def init_app():
     os.environ["HTTP_PROXY"] = "http://127.0.0.1:7897"
     os.environ["HTTP_PROXYS"] = "http://127.0.0.1:7897"
 
+    from extensions import config
+    from sqlite.database import init_db
+    from sqlite.blacklist import load_blacklist
+    from sqlite import group_record, audit_cache
+    init_db()
+    logger.info(f'Loaded {load_blacklist()} blacklist entries')
+    logger.info(f'Purged {audit_cache.purge_expired()} expired audit verdicts')
+    group_record.configure_retention(config.get('join_record_retention_days'))
+    logger.info(f'Warmed join count cache with {group_record.warm_join_count_cache()} users')
+    group_record.start_compaction(config.get('join_record_compaction_interval', 24 * 3600))
+
     from utils.update import do_check
     do_check()
+
+    from utils.member_store import member_store
+    member_store.start_refresh()
+
+    from utils.welcome_pool import welcome_pool
+    welcome_pool.prefill(config.get('group_ids', []))
     logger.info('Starting Flask application...')
 
 if __name__ == '__main__':
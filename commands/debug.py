@@ -1,5 +1,5 @@
 from typing import Optional
-from http_requests.send_group_msg import send_group_msg
+from utils.send_queue import queue_group_msg
 from extensions import logger
 from sqlite import group_record
 
@@ -14,7 +14,7 @@ def execute(args: Optional[list], group_id: int, user_id: int):
     """
     try:
         if not args or len(args) < 1:
-            send_group_msg(group_id, "请提供要检查的QQ号")
+            queue_group_msg(group_id, "请提供要检查的QQ号")
             return
             
         target_qq = int(args[0])
@@ -37,10 +37,10 @@ def execute(args: Optional[list], group_id: int, user_id: int):
             f"状态: {'超过限制' if join_count >= max_joins else '未超过限制'}"
         )
         
-        send_group_msg(group_id, debug_info)
+        queue_group_msg(group_id, debug_info)
         
     except ValueError:
-        send_group_msg(group_id, "无效的QQ号，请提供正确的数字")
+        queue_group_msg(group_id, "无效的QQ号，请提供正确的数字")
     except Exception as e:
         logger.error(f"检查用户加群次数失败: {e}")
-        send_group_msg(group_id, f"检查失败: {str(e)}")
\ No newline at end of file
+        queue_group_msg(group_id, f"检查失败: {str(e)}")
\ No newline at end of file
@@ -1,7 +1,7 @@
 
 from typing import Optional
 from random import randint
-from http_requests.send_group_msg import send_group_msg
+from utils.send_queue import queue_group_msg
 
 def execute(args: Optional[list], group_id: int, user_id: int):
     """
@@ -33,4 +33,4 @@ def execute(args: Optional[list], group_id: int, user_id: int):
     ]
 
     # Send the message
-    send_group_msg(group_id, message)
\ No newline at end of file
+    queue_group_msg(group_id, message)
\ No newline at end of file
@@ -1,7 +1,7 @@
 from typing import Optional
-from http_requests.send_group_msg import send_group_msg
+from utils.send_queue import queue_group_msg
 from extensions import config, logger
-from llm.gemini import GeminiAPI, GeminiConfig
+from llm.gemini import get_gemini_api
 from http_requests.get_group_member_info import get_group_member_info
 from http_requests.get_group_msg_history import get_user_messages_in_group
 
@@ -21,7 +21,7 @@ def execute(args: Optional[list], group_id: int, user_id: int):
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 无法获取您的权限信息"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     # 统一检查用户权限
@@ -31,7 +31,7 @@ def execute(args: Optional[list], group_id: int, user_id: int):
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 您没有使用此命令的权限"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     # 检查是否提供了攻击目标
@@ -40,7 +40,7 @@ def execute(args: Optional[list], group_id: int, user_id: int):
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 请指定攻击目标"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     # Extract target from message/args
@@ -56,7 +56,7 @@ def execute(args: Optional[list], group_id: int, user_id: int):
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 无法获取目标信息"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     target_data = target_info.get("data", {})
@@ -71,12 +71,11 @@ def execute(args: Optional[list], group_id: int, user_id: int):
             }
         }
     ]
-    send_group_msg(group_id, message)
+    queue_group_msg(group_id, message)
 
     # 调用GeminiAPI生成攻击描述
     try:
-        gemini_config = GeminiConfig(api_key=config['gemini_api_key'])
-        api = GeminiAPI(config=gemini_config)
+        api = get_gemini_api()
 
         prompt = config.get("gemini_attack_prompt", "生成一段针对性的攻击内容，要求言辞尖锐但不过分，结合目标的信息。")
         
@@ -99,7 +98,7 @@ def execute(args: Optional[list], group_id: int, user_id: int):
             {"type": "at", "data": {"qq": target}},
             {"type": "text", "data": {"text": attack_desc}}
         ]
-        send_group_msg(group_id, follow_message)
+        queue_group_msg(group_id, follow_message)
 
     except Exception as e:
         logger.error(f"Error generating attack with Gemini: {e}")
@@ -107,4 +106,4 @@ def execute(args: Optional[list], group_id: int, user_id: int):
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 生成攻击内容时发生错误"}}
         ]
-        send_group_msg(group_id, error_message)
\ No newline at end of file
+        queue_group_msg(group_id, error_message)
\ No newline at end of file
@@ -0,0 +1,60 @@
+import time
+from typing import Optional
+from utils.send_queue import queue_group_msg
+from utils.permission import permission_service
+from sqlite import blacklist
+
+def execute(args: Optional[list], group_id: int, user_id: int):
+    """
+    查询拉黑状态命令执行入口
+
+    Args:
+        args: 命令参数 (需要查询的QQ号或@用户)
+        group_id: 群组ID
+        user_id: 执行命令的用户ID
+    """
+    is_admin = permission_service.is_admin(group_id, user_id)
+    if is_admin is None:
+        message = [
+            {"type": "at", "data": {"qq": str(user_id)}},
+            {"type": "text", "data": {"text": " 无法获取您的权限信息"}}
+        ]
+        queue_group_msg(group_id, message)
+        return
+
+    if not is_admin:
+        message = [
+            {"type": "at", "data": {"qq": str(user_id)}},
+            {"type": "text", "data": {"text": " 您没有使用此命令的权限"}}
+        ]
+        queue_group_msg(group_id, message)
+        return
+
+    if not args:
+        queue_group_msg(group_id, "用法: 拉黑查询 @用户 或 拉黑查询 QQ号")
+        return
+
+    try:
+        if isinstance(args[0], dict) and 'qq' in args[0].get('data', {}):
+            target_id = int(args[0]['data']['qq'])
+        else:
+            target_id = int(str(args[0]).strip())
+    except ValueError:
+        queue_group_msg(group_id, "无效的用户ID，请输入正确的QQ号")
+        return
+
+    # is_blacklisted 会顺带清除已过期的条目
+    entry = blacklist.get_blacklist_entry(target_id) if blacklist.is_blacklisted(target_id) else None
+    if entry is None:
+        queue_group_msg(group_id, f"用户 {target_id} 不在黑名单中")
+        return
+
+    created = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry['created_at']))
+    text = (
+        f"用户 {target_id} 已被拉黑\n"
+        f"原因: {entry['reason'] or '无'}\n"
+        f"操作人: {entry['operator_id'] or '未知'}\n"
+        f"拉黑时间: {created}\n"
+        f"到期时间: {blacklist.format_expiry(entry['expires_at'])}"
+    )
+    queue_group_msg(group_id, text)
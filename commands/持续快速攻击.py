@@ -1,8 +1,8 @@
 from typing import Optional, Set, Dict
 from blinker import signal
-from http_requests.send_group_msg import send_group_msg
+from utils.send_queue import queue_group_msg
 from extensions import config
-from http_requests.get_group_member_info import get_group_member_info
+from utils.permission import permission_service
 
 from commands.快速攻击 import execute as quick_attack_execute
 
@@ -21,16 +21,12 @@ def execute(args: Optional[list], group_id: int, user_id: int):
     Continuous Quick Attack command entry point
     """
     # Check permissions
-    user_info = get_group_member_info(group_id, user_id, no_cache=True)
-    if user_info.get("status") == "failed" or (
-        user_id not in config['admin_ids'] and 
-        user_info.get("data", {}).get("role") not in ["owner", "admin"]
-    ):
+    if not permission_service.is_admin(group_id, user_id):
         message = [
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 您没有使用此命令的权限"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     # Check arguments
@@ -39,7 +35,7 @@ def execute(args: Optional[list], group_id: int, user_id: int):
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 请指定攻击目标"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     # Extract target
@@ -72,7 +68,7 @@ def execute(args: Optional[list], group_id: int, user_id: int):
         should_attack = True
 
     # Send status message
-    send_group_msg(group_id, message)
+    queue_group_msg(group_id, message)
     
     # Execute first attack for new target
     if should_attack:
@@ -1,8 +1,8 @@
 from typing import Optional, Set, Dict
 from blinker import signal
-from http_requests.send_group_msg import send_group_msg
+from utils.send_queue import queue_group_msg
 from extensions import config
-from http_requests.get_group_member_info import get_group_member_info
+from utils.permission import permission_service
 from http_requests.set_group_ban import set_group_ban
 from commands.攻击 import execute as attack_execute
 
@@ -22,16 +22,12 @@ def execute(args: Optional[list], group_id: int, user_id: int):
     持续攻击命令执行入口
     """
     # 权限检查
-    user_info = get_group_member_info(group_id, user_id, no_cache=True)
-    if user_info.get("status") == "failed" or (
-        user_id not in config['admin_ids'] and 
-        user_info.get("data", {}).get("role") not in ["owner", "admin"]
-    ):
+    if not permission_service.is_admin(group_id, user_id):
         message = [
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 您没有使用此命令的权限"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     # 检查参数
@@ -40,7 +36,7 @@ def execute(args: Optional[list], group_id: int, user_id: int):
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 请指定攻击目标"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     # 提取目标
@@ -73,7 +69,7 @@ def execute(args: Optional[list], group_id: int, user_id: int):
         should_attack = True
 
     # 先发送状态消息
-    send_group_msg(group_id, message)
+    queue_group_msg(group_id, message)
     
     # 如果是新增目标，才执行首次攻击
     if should_attack:
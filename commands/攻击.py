@@ -1,8 +1,8 @@
-import asyncio
 from typing import Optional
-from http_requests.send_group_msg import send_group_msg
+from utils.send_queue import queue_group_msg, MessagePriority
 from extensions import config, logger
 from llm.deepseek import DeepseekAPI, DeepseekConfig
+from llm.loop import run_sync
 from http_requests.get_group_member_info import get_group_member_info
 from http_requests.get_group_msg_history import get_user_messages_in_group
 import random
@@ -29,9 +29,8 @@ async def process_attack(api, prompt, group_id, target):
             {"type": "at", "data": {"qq": target}}
             ]
 
-        send_group_msg(group_id, follow_message)
-        # 添加短暂延迟，避免消息发送过快
-        await asyncio.sleep(0.5)
+        # 入队后立即返回，由发送队列按群限速，不阻塞共享的 LLM 事件循环
+        queue_group_msg(group_id, follow_message, priority=MessagePriority.LOW)
 
 def execute(args: Optional[list], group_id: int, user_id: int):
     """
@@ -49,7 +48,7 @@ def execute(args: Optional[list], group_id: int, user_id: int):
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 无法获取您的权限信息"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     # 统一检查用户权限
@@ -59,7 +58,7 @@ def execute(args: Optional[list], group_id: int, user_id: int):
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 您没有使用此命令的权限"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     # 检查是否提供了攻击目标
@@ -78,7 +77,7 @@ def execute(args: Optional[list], group_id: int, user_id: int):
                 }
             }
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     # Extract target from message/args
@@ -99,7 +98,7 @@ def execute(args: Optional[list], group_id: int, user_id: int):
                 "data": {"text": " 无法获取目标信息"}
             }
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     target_data = target_info.get("data", {})
@@ -114,7 +113,7 @@ def execute(args: Optional[list], group_id: int, user_id: int):
             }
         }
     ]
-    send_group_msg(group_id, message)
+    queue_group_msg(group_id, message)
 
     # 修改DeepseekAPI初始化，启用流式输出
     deepseek_config = DeepseekConfig(
@@ -137,5 +136,5 @@ def execute(args: Optional[list], group_id: int, user_id: int):
     if len(args) > 1:
         prompt = prompt + f"\n\n注意：{args[1]}"
 
-    # 替换原有的直接调用为异步处理
-    asyncio.run(process_attack(api, prompt, group_id, target))
\ No newline at end of file
+    # 在 LLM 事件循环中处理流式响应
+    run_sync(process_attack(api, prompt, group_id, target))
\ No newline at end of file
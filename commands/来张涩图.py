@@ -2,7 +2,7 @@ import os
 from typing import Optional
 import requests
 from extensions import logger
-from http_requests.send_group_msg import send_group_msg
+from utils.send_queue import queue_group_msg
 import urllib.parse
 
 def execute(args: Optional[list], group_id: int, user_id: int):
@@ -30,20 +30,20 @@ def execute(args: Optional[list], group_id: int, user_id: int):
         
         if response.status_code == 200:
             # 发送图片消息
-            send_group_msg(group_id, [
+            queue_group_msg(group_id, [
                 {"type": "image", "data": {
                     "file": response.url,
                 }}
             ])
         else:
             logger.error(f"API error: status_code={response.status_code}, response={response.text}")
-            send_group_msg(group_id, [
+            queue_group_msg(group_id, [
                 {"type": "text", "data": {"text": f"获取图片失败 (错误码: {response.status_code})"}}
             ])
 
     except Exception as e:
         logger.error(f"Error in 来张涩图: {e}")
-        send_group_msg(group_id, [
+        queue_group_msg(group_id, [
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": f" 处理过程中发生错误：{str(e)}"}}
         ])
@@ -1,44 +1,63 @@
+import re
+import time
 from typing import Optional
-from extensions import logger, config
-from http_requests.send_group_msg import send_group_msg
-from http_requests.get_group_member_info import get_group_member_info
-from sqlite import group_record
-from datetime import datetime
+from extensions import logger
+from utils.send_queue import queue_group_msg
+from utils.permission import permission_service
+from sqlite import blacklist
 from http_requests.set_group_kick import set_group_kick
 
+# 拉黑时长，如 30m、12h、7d
+DURATION_PATTERN = re.compile(r'^(\d+)([mhd])$')
+DURATION_UNITS = {'m': 60, 'h': 3600, 'd': 24 * 3600}
+
+def _arg_text(arg) -> str:
+    """提取参数中的文字: 字符串参数原样返回，文本消息段取其 text，其余消息段忽略"""
+    if isinstance(arg, str):
+        return arg
+    if isinstance(arg, dict) and arg.get('type') == 'text':
+        return arg.get('data', {}).get('text', '')
+    return ''
+
+def _parse_duration(token: str) -> Optional[int]:
+    """解析拉黑时长，返回秒数，不是时长格式时返回 None"""
+    match = DURATION_PATTERN.match(token)
+    if not match:
+        return None
+    return int(match.group(1)) * DURATION_UNITS[match.group(2)]
+
 def execute(args: Optional[list], group_id: int, user_id: int):
     """
     永久踢出命令执行入口
     
     Args:
-        args: 命令参数 (需要被踢出用户的QQ号或@用户)
+        args: 命令参数 (需要被踢出用户的QQ号或@用户，之后可附带拉黑时长(如 7d、12h、30m，默认永久)和原因)
         group_id: 群组ID
         user_id: 执行命令的用户ID
     """
     # 检查是否有权限执行此命令
     # Get user's info and check if they are admin
-    user_info = get_group_member_info(group_id, user_id, no_cache=True)
-    if user_info.get("status") == "failed":
+    is_admin = permission_service.is_admin(group_id, user_id)
+    if is_admin is None:
         message = [
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 无法获取您的权限信息"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     # 统一检查用户权限
-    user_role = user_info.get("data", {}).get("role")
-    if user_id not in config['admin_ids'] and user_role not in ["owner", "admin"]:
+    if not is_admin:
         message = [
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 您没有使用此命令的权限"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     # 检查参数
-    if not args or len(args) != 1:
-        send_group_msg(group_id, "用法: 永久踢出 @用户 或 永久踢出 QQ号")
+    if not args:
+        queue_group_msg(group_id, "用法: 永久踢出 @用户 [时长] [原因] 或 永久踢出 QQ号 [时长] [原因]，时长如 7d、12h、30m，不填为永久")
         return
 
     try:
@@ -50,25 +69,29 @@ def execute(args: Optional[list], group_id: int, user_id: int):
             # 尝试将参数直接解析为QQ号
             target_id = int(args[0].strip())
         
-        # 获取最大允许加群次数
-        max_joins = config.get('max_joins', 2)
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # 其余参数中的文字(包括 @用户 之后的文本消息段)，第一个词可以是拉黑时长，其余作为原因
+        words = " ".join(_arg_text(arg) for arg in args[1:]).split()
+        duration = _parse_duration(words[0]) if words else None
+        if duration is not None:
+            words = words[1:]
+        reason = " ".join(words)
+        expires_at = int(time.time()) + duration if duration is not None else None
 
-        # 写入多次加群记录以超过限制
-        for _ in range(max_joins):
-            group_record.add_record(target_id, group_id, current_time)
+        # 加入黑名单
+        blacklist.add_to_blacklist(target_id, reason=reason, operator_id=user_id, expires_at=expires_at)
+        scope = "永久黑名单" if expires_at is None else f"黑名单(至 {blacklist.format_expiry(expires_at)})"
 
         # 踢出用户
         kick_result = set_group_kick(group_id, target_id)
         if kick_result.get("status") == "ok":
-            send_group_msg(group_id, f"已将用户 {target_id} 踢出并加入永久黑名单")
+            queue_group_msg(group_id, f"已将用户 {target_id} 踢出并加入{scope}")
         else:
-            send_group_msg(group_id, f"已将用户 {target_id} 加入永久黑名单，但踢出失败")
+            queue_group_msg(group_id, f"已将用户 {target_id} 加入{scope}，但踢出失败")
             
         logger.info(f"User {target_id} has been permanently banned from joining by admin {user_id}")
 
     except ValueError:
-        send_group_msg(group_id, "无效的用户ID，请输入正确的QQ号")
+        queue_group_msg(group_id, "无效的用户ID，请输入正确的QQ号")
     except Exception as e:
         logger.error(f"Error in permanent ban command: {str(e)}")
-        send_group_msg(group_id, "执行命令时发生错误")
\ No newline at end of file
+        queue_group_msg(group_id, "执行命令时发生错误")
\ No newline at end of file
@@ -1,10 +1,14 @@
 import time
 from typing import Optional, Dict, List
-from http_requests.send_group_msg import send_group_msg
-from extensions import logger, config
-from http_requests.get_group_member_info import get_group_member_info
-from http_requests.get_group_member_list import get_group_member_list
-from http_requests.set_group_kick import set_group_kick  # 修改导入语句
+from utils.send_queue import queue_group_msg
+from extensions import config
+from utils.permission import permission_service
+from utils.member_store import member_store
+from utils.cleanup_policy import policy_registry
+from utils.bulk_kick import BulkKickJob, bulk_kick_executor
+
+# 汇总消息中最多列出的失败成员数
+MAX_FAILURES_SHOWN = 20
 
 class PendingKicks:
     _instance = None
@@ -29,54 +33,80 @@ class PendingKicks:
 
 pending_kicks = PendingKicks()
 
-def calculate_member_weight(member: dict) -> float:
-    """
-    计算成员权重，用于决定清理优先级
-    权重越高越可能被清理
-    """
-    last_sent_time = member.get("last_sent_time", 0)
-    level = member.get("level", "0")
-    
-    try:
-        level_num = int(level)
-    except (ValueError, TypeError):
-        level_num = 0
-        
-    # 计算距离现在的天数
-    import time
-    days_inactive = (time.time() - last_sent_time) / (24 * 3600)
-    
-    # 权重计算：未发言天数 / (等级 + 1)
-    # 等级越高，权重越低；未发言时间越长，权重越高
-    return days_inactive / (level_num + 1)
+def _reply(group_id: int, user_id: int, text: str):
+    queue_group_msg(group_id, [
+        {"type": "at", "data": {"qq": str(user_id)}},
+        {"type": "text", "data": {"text": text}}
+    ])
+
+def _on_progress(job: BulkKickJob, processed: int):
+    step = config.get('bulk_kick_progress_step', 50)
+    if step and processed % step == 0 and processed < len(job.targets):
+        _reply(job.group_id, job.operator_id, f" 清理进度: {processed}/{len(job.targets)}")
+
+def _on_done(job: BulkKickJob):
+    """发送清理汇总，失败及被取消的成员保存为待处理列表，可再次确认重试"""
+    text = f" 清理完成。成功: {len(job.succeeded)}, 失败: {len(job.failed)}"
+    if job.skipped:
+        text += f", 已取消: {len(job.skipped)}"
+    if job.failed:
+        text += "\n失败成员："
+        for target_id, reason in list(job.failed.items())[:MAX_FAILURES_SHOWN]:
+            text += f"\n{target_id}: {reason}"
+        if len(job.failed) > MAX_FAILURES_SHOWN:
+            text += f"\n... 共 {len(job.failed)} 名"
+
+    retry = job.retry_targets()
+    if retry:
+        pending_kicks.add(job.group_id, job.operator_id, retry)
+        text += f"\n\n回复'确认清理'重试剩余 {len(retry)} 名成员"
+    _reply(job.group_id, job.operator_id, text)
 
 def execute(args: Optional[list], group_id: int, user_id: int):
     """
     清理群成员命令执行入口
     
     Args:
-        args: 命令参数 (可选，第一个参数可以是数量或"确认清理")
+        args: 命令参数 (可选，第一个参数可以是数量、"确认清理"、"取消清理"、"清理进度"或"策略"，
+              第二个参数可以指定清理策略名)
         group_id: 群组ID
         user_id: 执行命令的用户ID
     """
     # 检查用户权限
-    user_info = get_group_member_info(group_id, user_id, no_cache=True)
-    if user_info.get("status") == "failed":
+    is_admin = permission_service.is_admin(group_id, user_id)
+    if is_admin is None:
         message = [
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 无法获取您的权限信息"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     # 只允许群主和管理员使用
-    user_role = user_info.get("data", {}).get("role")
-    if user_id not in config['admin_ids'] and user_role not in ["owner", "admin"]:
+    if not is_admin:
         message = [
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 您没有使用此命令的权限"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
+        return
+
+    # 取消正在进行的清理
+    if args and args[0] == "取消清理":
+        if bulk_kick_executor.cancel(group_id):
+            _reply(group_id, user_id, " 已取消清理，正在执行的请求完成后将发送汇总")
+        else:
+            _reply(group_id, user_id, " 没有正在进行的清理任务")
+        return
+
+    # 查询清理进度
+    if args and args[0] == "清理进度":
+        job = bulk_kick_executor.get_job(group_id)
+        if job is None:
+            _reply(group_id, user_id, " 没有正在进行的清理任务")
+        else:
+            progress = job.progress()
+            _reply(group_id, user_id, f" 清理进度: {progress['processed']}/{progress['total']}，失败 {progress['failed']}")
         return
 
     # 处理确认清理的情况
@@ -87,36 +117,29 @@ def execute(args: Optional[list], group_id: int, user_id: int):
                 {"type": "at", "data": {"qq": str(user_id)}},
                 {"type": "text", "data": {"text": " 没有待处理的清理操作"}}
             ]
-            send_group_msg(group_id, message)
+            queue_group_msg(group_id, message)
             return
 
-        # 执行踢人操作
-        success = 0
-        failed = 0
-        for target_id in to_kick:
-            try:
-                # 正确调用set_group_kick函数
-                result = set_group_kick(group_id, target_id)
-                if result.get("status") == "ok":
-                    success += 1
-                else:
-                    logger.error(f"Failed to kick member {target_id}: {result.get('message', 'Unknown error')}")
-                    failed += 1
-                # 添加限速，每两个成员之间暂停0.5秒
-                time.sleep(0.5)
-            except Exception as e:
-                logger.error(f"Failed to kick member {target_id}: {e}")
-                failed += 1
-
-        # 清理临时存储
+        # 先清理临时存储再提交: 任务可能很快完成，_on_done 会写入新的重试列表
         pending_kicks.remove(group_id, user_id)
+        job, started = bulk_kick_executor.submit(
+            group_id, user_id, to_kick,
+            on_progress=_on_progress,
+            on_done=_on_done
+        )
+        if not started:
+            pending_kicks.add(group_id, user_id, to_kick)
+            _reply(group_id, user_id, f" 已有清理任务在进行中 ({job.progress()['processed']}/{len(job.targets)})，可回复'取消清理'终止")
+            return
 
-        # 发送结果消息
-        message = [
-            {"type": "at", "data": {"qq": str(user_id)}},
-            {"type": "text", "data": {"text": f" 清理完成。成功: {success}, 失败: {failed}"}}
-        ]
-        send_group_msg(group_id, message)
+        # 完成后发送汇总
+        _reply(group_id, user_id, f" 开始清理 {len(to_kick)} 名成员，可回复'清理进度'查看进度或'取消清理'终止")
+        return
+
+    # 列出可用的清理策略
+    if args and args[0] == "策略":
+        current = policy_registry.for_group(group_id).name
+        _reply(group_id, user_id, f" 可用清理策略: {', '.join(policy_registry.names())}\n本群默认策略: {current}")
         return
 
     # 设置默认清理数量
@@ -129,43 +152,41 @@ def execute(args: Optional[list], group_id: int, user_id: int):
                 {"type": "at", "data": {"qq": str(user_id)}},
                 {"type": "text", "data": {"text": " 请输入有效的数字"}}
             ]
-            send_group_msg(group_id, message)
+            queue_group_msg(group_id, message)
+            return
+
+    # 选择清理策略，未指定时使用本群配置的策略
+    if args and len(args) > 1:
+        policy = policy_registry.get(str(args[1]))
+        if policy is None:
+            _reply(group_id, user_id, f" 未知的清理策略: {args[1]}，可用策略: {', '.join(policy_registry.names())}")
             return
+    else:
+        policy = policy_registry.for_group(group_id)
 
     # 获取群成员列表
-    members_response = get_group_member_list(group_id)
-    if members_response.get("status") == "failed":
+    table = member_store.get_table(group_id)
+    if table is None:
         message = [
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 获取群成员列表失败"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
-    # 修改排序逻辑，使用权重排序
-    members = sorted(
-        members_response.get("data", []),
-        key=lambda x: calculate_member_weight(x),
-        reverse=True  # 权重高的排在前面
-    )
-
-    # 筛选要清理的成员（排除管理员和群主）
-    to_kick = []
-    for member in members:
-        if (member.get("role") not in ["owner", "admin"] and 
-            len(to_kick) < target_count):
-            to_kick.append(member)
+    # 按策略打分选出要清理的成员，豁免规则(管理员、群主、机器人等)由策略决定
+    to_kick = policy.select(table, target_count)
 
     if not to_kick:
         message = [
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 没有可清理的成员"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     # 修改确认消息，显示等级信息
-    confirm_text = f"即将清理以下 {len(to_kick)} 名成员：\n"
+    confirm_text = f"按策略 {policy.name} 即将清理以下 {len(to_kick)} 名成员：\n"
     for member in to_kick:
         name = member.get("card") or member.get("nickname") or str(member.get("user_id"))
         level = member.get("level", "未知")
@@ -177,7 +198,7 @@ def execute(args: Optional[list], group_id: int, user_id: int):
         {"type": "at", "data": {"qq": str(user_id)}},
         {"type": "text", "data": {"text": confirm_text}}
     ]
-    send_group_msg(group_id, message)
+    queue_group_msg(group_id, message)
 
     # 存储待清理列表供确认时使用
     pending_kicks.add(group_id, user_id, [member.get("user_id") for member in to_kick])
\ No newline at end of file
@@ -1,8 +1,8 @@
 from typing import Optional
-from http_requests.send_group_msg import send_group_msg
-from extensions import config
-from http_requests.get_group_member_info import get_group_member_info
+from utils.send_queue import queue_group_msg
+from utils.permission import permission_service
 from sqlite.group_record import clear_user_records, get_user_join_count
+from sqlite import blacklist
 
 # filepath: d:\AuroraProjects\Python\JZY_SH\commands\清空次数.py
 
@@ -16,23 +16,22 @@ def execute(args: Optional[list], group_id: int, user_id: int):
         user_id: 执行命令的用户ID
     """
     # Get user's info and check if they are admin
-    user_info = get_group_member_info(group_id, user_id, no_cache=True)
-    if user_info.get("status") == "failed":
+    is_admin = permission_service.is_admin(group_id, user_id)
+    if is_admin is None:
         message = [
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 无法获取您的权限信息"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     # 统一检查用户权限
-    user_role = user_info.get("data", {}).get("role")
-    if user_id not in config['admin_ids'] and user_role not in ["owner", "admin"]:
+    if not is_admin:
         message = [
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 您没有使用此命令的权限"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     # 检查是否提供了QQ号
@@ -41,7 +40,7 @@ def execute(args: Optional[list], group_id: int, user_id: int):
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 请提供要清空加群次数的QQ号"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     # 获取目标QQ号
@@ -52,18 +51,22 @@ def execute(args: Optional[list], group_id: int, user_id: int):
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " QQ号必须是数字"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     # 获取当前加群次数
     current_count = get_user_join_count(target_qq)
     
-    # 清空加群记录
+    # 清空加群记录，同时解除拉黑(永久踢出原先通过写入加群记录实现，清空次数即可解封)
     deleted_count = clear_user_records(target_qq)
-    
+    unbanned = blacklist.remove_from_blacklist(target_qq)
+
     # 发送操作结果
+    text = f" 已清空QQ {target_qq} 的加群记录，共删除 {deleted_count} 条记录（原加群次数: {current_count}）"
+    if unbanned:
+        text += "，并已解除拉黑"
     message = [
         {"type": "at", "data": {"qq": str(user_id)}},
-        {"type": "text", "data": {"text": f" 已清空QQ {target_qq} 的加群记录，共删除 {deleted_count} 条记录（原加群次数: {current_count}）"}}
+        {"type": "text", "data": {"text": text}}
     ]
-    send_group_msg(group_id, message)
\ No newline at end of file
+    queue_group_msg(group_id, message)
\ No newline at end of file
@@ -1,7 +1,7 @@
 from typing import Optional
-from http_requests.send_group_msg import send_group_msg
-from http_requests.get_group_member_info import get_group_member_info
-from extensions import config
+from utils.send_queue import queue_group_msg, send_queue
+from utils.permission import permission_service
+from sqlite import group_record
 import sys
 
 def execute(args: Optional[list], group_id: int, user_id: int):
@@ -14,23 +14,22 @@ def execute(args: Optional[list], group_id: int, user_id: int):
         user_id: 执行命令的用户ID
     """
     # Get user's info and check if they are admin
-    user_info = get_group_member_info(group_id, user_id, no_cache=True)
-    if user_info.get("status") == "failed":
+    is_admin = permission_service.is_admin(group_id, user_id)
+    if is_admin is None:
         message = [
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 无法获取您的权限信息"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     # Check user permissions
-    user_role = user_info.get("data", {}).get("role")
-    if user_id not in config['admin_ids'] and user_role not in ["owner", "admin"]:
+    if not is_admin:
         message = [
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 您没有使用此命令的权限"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     # Send confirmation message before termination
@@ -38,8 +37,12 @@ def execute(args: Optional[list], group_id: int, user_id: int):
         {"type": "at", "data": {"qq": str(user_id)}},
         {"type": "text", "data": {"text": " 正在终止进程..."}}
     ]
-    send_group_msg(group_id, message)
+    queue_group_msg(group_id, message)
     
+    # os._exit 不会执行 atexit，先将待写入的加群记录落库，并等待排队中的消息发出
+    group_record.flush()
+    send_queue.flush(timeout=5)
+
     # Force terminate the process
     import os
     os._exit(0)
\ No newline at end of file
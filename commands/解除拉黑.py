@@ -0,0 +1,50 @@
+from typing import Optional
+from extensions import logger
+from utils.send_queue import queue_group_msg
+from utils.permission import permission_service
+from sqlite import blacklist
+
+def execute(args: Optional[list], group_id: int, user_id: int):
+    """
+    解除拉黑命令执行入口
+
+    Args:
+        args: 命令参数 (需要解除拉黑的QQ号或@用户)
+        group_id: 群组ID
+        user_id: 执行命令的用户ID
+    """
+    is_admin = permission_service.is_admin(group_id, user_id)
+    if is_admin is None:
+        message = [
+            {"type": "at", "data": {"qq": str(user_id)}},
+            {"type": "text", "data": {"text": " 无法获取您的权限信息"}}
+        ]
+        queue_group_msg(group_id, message)
+        return
+
+    if not is_admin:
+        message = [
+            {"type": "at", "data": {"qq": str(user_id)}},
+            {"type": "text", "data": {"text": " 您没有使用此命令的权限"}}
+        ]
+        queue_group_msg(group_id, message)
+        return
+
+    if not args:
+        queue_group_msg(group_id, "用法: 解除拉黑 @用户 或 解除拉黑 QQ号")
+        return
+
+    try:
+        if isinstance(args[0], dict) and 'qq' in args[0].get('data', {}):
+            target_id = int(args[0]['data']['qq'])
+        else:
+            target_id = int(str(args[0]).strip())
+    except ValueError:
+        queue_group_msg(group_id, "无效的用户ID，请输入正确的QQ号")
+        return
+
+    if blacklist.remove_from_blacklist(target_id):
+        queue_group_msg(group_id, f"已解除用户 {target_id} 的拉黑")
+        logger.info(f"User {target_id} has been removed from blacklist by admin {user_id}")
+    else:
+        queue_group_msg(group_id, f"用户 {target_id} 不在黑名单中")
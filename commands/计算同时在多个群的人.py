@@ -1,8 +1,8 @@
 from typing import Optional, List, Dict
-from http_requests.send_group_msg import send_group_msg
+from utils.send_queue import queue_group_msg
 from http_requests.send_group_forward_msg import send_group_forward_msg
-from http_requests.get_group_member_list import get_group_member_list
-from http_requests.get_group_member_info import get_group_member_info
+from utils.member_store import member_store
+from utils.permission import permission_service
 from extensions import config
 
 def chunk_members(members: dict, chunk_size: int = 50) -> List[Dict]:
@@ -35,23 +35,22 @@ def execute(args: Optional[list], group_id: int, user_id: int):
         user_id: 执行命令的用户ID
     """
     # Get user's info and check if they are admin
-    user_info = get_group_member_info(group_id, user_id, no_cache=True)
-    if user_info.get("status") == "failed":
+    is_admin = permission_service.is_admin(group_id, user_id)
+    if is_admin is None:
         message = [
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 无法获取您的权限信息"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     # Check user permissions
-    user_role = user_info.get("data", {}).get("role")
-    if user_id not in config['admin_ids'] and user_role not in ["owner", "admin"]:
+    if not is_admin:
         message = [
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": " 您没有使用此命令的权限"}}
         ]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     # 解析最少群数参数
@@ -64,14 +63,14 @@ def execute(args: Optional[list], group_id: int, user_id: int):
                     {"type": "at", "data": {"qq": str(user_id)}},
                     {"type": "text", "data": {"text": " 最少群数必须大于等于2"}}
                 ]
-                send_group_msg(group_id, message)
+                queue_group_msg(group_id, message)
                 return
         except ValueError:
             message = [
                 {"type": "at", "data": {"qq": str(user_id)}},
                 {"type": "text", "data": {"text": " 参数格式错误，请输入有效的数字"}}
             ]
-            send_group_msg(group_id, message)
+            queue_group_msg(group_id, message)
             return
     else:
         min_groups = 2
@@ -79,20 +78,12 @@ def execute(args: Optional[list], group_id: int, user_id: int):
     # 获取配置中的所有群
     group_ids = config['group_ids']
     
-    # 存储每个群的成员
-    members_by_group = {}
+    # 从成员缓存读取每个群的成员
+    members_by_group = member_store.get_members_by_group(group_ids)
     # 存储用户出现在哪些群
     user_groups = {}
     
-    # 获取所有群的成员列表
-    for gid in group_ids:
-        response = get_group_member_list(gid)
-        if isinstance(response, dict) and 'data' in response:
-            members = response['data']
-        else:
-            members = response
-        members_by_group[gid] = members
-        
+    for gid, members in members_by_group.items():
         # 记录每个用户在哪些群出现
         for member in members:
             if isinstance(member, dict):
@@ -112,7 +103,7 @@ def execute(args: Optional[list], group_id: int, user_id: int):
     if not multi_group_users:
         min_groups_text = f"至少{min_groups}个" if min_groups else "多个"
         message = [{"type": "text", "data": {"text": f"没有找到同时在{min_groups_text}群的成员"}}]
-        send_group_msg(group_id, message)
+        queue_group_msg(group_id, message)
         return
 
     # 准备转发消息
@@ -2,13 +2,21 @@ import os
 import uuid
 from typing import Optional
 import requests
-from extensions import config, logger
-from http_requests.send_group_msg import send_group_msg
-from llm.gemini import GeminiAPI, GeminiConfig
+from extensions import logger
+from utils.send_queue import queue_group_msg
+from llm.gemini import get_gemini_api
 import re
 
 # filepath: /d:/AuroraProjects/Python/JZY_SH/commands/语音聊天.py
 
+def _remove_temp_file(path: str):
+    """删除临时语音文件"""
+    if os.path.exists(path):
+        try:
+            os.remove(path)
+        except Exception as e:
+            logger.error(f"Error deleting temp file: {e}")
+
 def execute(args: Optional[list], group_id: int, user_id: int):
     """
     语音聊天命令执行入口
@@ -19,7 +27,7 @@ def execute(args: Optional[list], group_id: int, user_id: int):
         user_id: 执行命令的用户ID
     """
     if not args:
-        send_group_msg(group_id, [{"type": "text", "data": {"text": "请输入要聊天的内容"}}])
+        queue_group_msg(group_id, [{"type": "text", "data": {"text": "请输入要聊天的内容"}}])
         return
 
     # Join args to form the chat message
@@ -28,8 +36,7 @@ def execute(args: Optional[list], group_id: int, user_id: int):
 
     try:
         # 使用Gemini API生成回复
-        gemini_config = GeminiConfig(api_key=config['gemini_api_key'])
-        api = GeminiAPI(config=gemini_config)
+        api = get_gemini_api()
         response = api.chat(chat_text)
 
         # 转换为语音
@@ -69,28 +76,28 @@ def execute(args: Optional[list], group_id: int, user_id: int):
             with open(temp_file, "wb") as f:
                 f.write(tts_response.content)
 
-            # 发送语音消息
-            send_group_msg(group_id, [
+            # 发送语音消息，消息发出(或放弃发送)后再删除语音文件
+            future = queue_group_msg(group_id, [
                 {"type": "record", "data": {
                     "file": f"file:///{os.path.abspath(temp_file)}",
                 }}
             ])
+            sent_file = temp_file
+            temp_file = None
+            future.add_done_callback(lambda _: _remove_temp_file(sent_file))
         else:
             logger.error(f"TTS API error: status_code={tts_response.status_code}, response={tts_response.text}")
-            send_group_msg(group_id, [
+            queue_group_msg(group_id, [
                 {"type": "text", "data": {"text": f"语音合成失败 (错误码: {tts_response.status_code})"}}
             ])
 
     except Exception as e:
         logger.error(f"Error in 语音聊天: {e}")
-        send_group_msg(group_id, [
+        queue_group_msg(group_id, [
             {"type": "at", "data": {"qq": str(user_id)}},
             {"type": "text", "data": {"text": f" 处理过程中发生错误：{str(e)}"}}
         ])
     finally:
-        # 清理临时文件
-        if temp_file and os.path.exists(temp_file):
-            try:
-                os.remove(temp_file)
-            except Exception as e:
-                logger.error(f"Error deleting temp file: {e}")
\ No newline at end of file
+        # 语音消息未能入队时清理临时文件
+        if temp_file:
+            _remove_temp_file(temp_file)
\ No newline at end of file
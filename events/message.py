@@ -2,6 +2,7 @@ from typing import Dict, Any
 from extensions import logger
 from commands.message_parser import parse_command, process_command
 from blinker import signal
+from utils.member_store import member_store
 
 def handle_message(data: Dict[str, Any]) -> None:
     """
@@ -29,6 +30,10 @@ def handle_group_message(data: Dict[str, Any]) -> None:
     message = data.get('message', '')
     group_id = data.get('group_id')
     user_id = data.get('user_id')
+
+    # 更新成员缓存中的最后发言时间
+    if group_id and user_id:
+        member_store.touch(group_id, user_id, data.get('time'))
     
     # 发送消息信号
     message_signal = signal('message')
@@ -1,11 +1,14 @@
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
-from extensions import logger, config
+from extensions import logger
 from sqlite import group_record
-from llm.gemini import GeminiAPI, GeminiConfig
-from http_requests.send_group_msg import send_group_msg
-import time
+from utils.send_queue import queue_group_msg
+from utils.welcome_pool import welcome_pool
+from utils.scheduler import scheduler
+
+# 延迟发送欢迎语，确保新成员已在群内注册
+WELCOME_DELAY = 2
 
 class GroupEventType(Enum):
     INCREASE = 'group_increase'
@@ -48,26 +51,16 @@ def handle_group_increase(data: Dict[str, Any]) -> bool:
                 f'Group Join Event - [Group: {event_data.group_id}] '
                 f'[User: {event_data.user_id}] [Operator: {event_data.operator_id}]'
             )
-            group_record.add_record(event_data.group_id, event_data.user_id)
+            group_record.add_record(event_data.user_id, event_data.group_id)
 
-            # @该加群群员并发送通知（使用大模型）
+            # @该加群群员并发送通知（欢迎语由大模型预先生成）
             try:
-                # Initialize Gemini API
-                gemini_config = GeminiConfig(api_key=config['gemini_api_key'])
-                api = GeminiAPI(config=gemini_config)
-
-                # Generate welcome message
-                prompt = "生成一段对一位新人的欢迎加群语，内容包含：\n群公告获取整合，仔细看完所有公告，注意群规，违反立刻踢掉"
-                welcome_msg = api.chat(prompt)
-
-                # Send welcome message - Add delay to ensure user is registered
-                time.sleep(2)  # Wait 2 seconds before sending the welcome message
-                
+                welcome_msg = welcome_pool.pop(event_data.group_id)
                 message = [
                     {"type": "at", "data": {"qq": str(event_data.user_id)}},
                     {"type": "text", "data": {"text": " " + welcome_msg}}
                 ]
-                send_group_msg(event_data.group_id, message)
+                scheduler.schedule_after(WELCOME_DELAY, queue_group_msg, event_data.group_id, message)
             except Exception as e:
                 logger.error(f"Failed to send welcome message: {e}")
 
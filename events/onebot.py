@@ -4,6 +4,8 @@ from .notice import handle_group_increase
 from .request import handle_group_request
 from .message import handle_message
 from extensions import config, logger
+from utils.permission import permission_service
+from utils.member_store import member_store
 
 class PostType(Enum):
     NOTICE = "notice"
@@ -12,6 +14,9 @@ class PostType(Enum):
 
 class NoticeType(Enum):
     GROUP_INCREASE = "group_increase"
+    GROUP_DECREASE = "group_decrease"
+    GROUP_ADMIN = "group_admin"
+    GROUP_CARD = "group_card"
 
 def validate_group(group_id: Optional[int]) -> bool:
     """验证群组ID是否合法"""
@@ -51,8 +56,23 @@ def handle_event(data: Dict[str, Any]) -> None:
 def handle_notice_event(data: Dict[str, Any]) -> None:
     """处理通知类型事件"""
     notice_type = data.get('notice_type')
+
+    # 成员变动或管理员变动时使角色缓存失效
+    if notice_type in (NoticeType.GROUP_INCREASE.value, NoticeType.GROUP_DECREASE.value,
+                       NoticeType.GROUP_ADMIN.value):
+        permission_service.invalidate(data.get('group_id'), data.get('user_id'))
+
+    group_id = data.get('group_id')
+    user_id = data.get('user_id')
     if notice_type == NoticeType.GROUP_INCREASE.value:
+        member_store.apply_increase(group_id, user_id, data.get('time'))
         handle_group_increase(data)
+    elif notice_type == NoticeType.GROUP_DECREASE.value:
+        member_store.apply_decrease(group_id, user_id)
+    elif notice_type == NoticeType.GROUP_CARD.value:
+        member_store.apply_card(group_id, user_id, data.get('card_new', ''))
+    elif notice_type == NoticeType.GROUP_ADMIN.value:
+        member_store.apply_admin(group_id, user_id, data.get('sub_type') == 'set')
 
 def handle_request_event(data: Dict[str, Any]) -> None:
     """处理请求类型事件"""
@@ -1,13 +1,14 @@
 from typing import Dict, Any, Optional, TypedDict, Tuple
 from functools import wraps
 from extensions import logger, config
-from http_requests.send_group_msg import send_group_msg
+from utils.send_queue import queue_group_msg, MessagePriority
 from http_requests.set_group_add_request import set_group_add_request
 from http_requests.get_stranger_info import get_stranger_info
 from enum import Enum
-from http_requests.get_group_member_info import get_group_member_info
+from http_requests.async_onebot_action import fan_out, async_get_group_member_info
 from audits.join_audit import JoinRequestAuditor
-from sqlite import group_record
+from utils.member_store import member_store
+from sqlite import group_record, blacklist
 
 class RequestData(TypedDict):
     sub_type: str
@@ -49,6 +50,11 @@ def handle_group_request(data: Dict[str, Any]) -> None:
     if request_data['sub_type'] != 'add':
         return
 
+    # 黑名单检查优先于其他所有检查
+    if blacklist.is_blacklisted(request_data['user_id']):
+        _reject_request(request_data, RejectReason.BLACKLISTED.value)
+        return
+
     if not request_data['comment']:
         _notify_admin(request_data, NotifyReason.EMPTY_COMMENT)
         return
@@ -77,17 +83,25 @@ def check_other_groups(user_id: int) -> bool:
     """Check if user is in other groups"""
     try:
         group_ids = config.get('group_ids', [])
-        for group_id in group_ids:
-            response = get_group_member_info(group_id, user_id)
-            if response.get('status') == 'ok' and response.get('retcode') == 0:
-                return True
-        return False
+
+        # 倒排索引未过期时直接查内存
+        groups = member_store.groups_of(user_id, group_ids)
+        if groups is not None:
+            return bool(groups)
+
+        # 索引过期时回退为并发查询所有群
+        responses = fan_out(async_get_group_member_info, group_ids, user_id)
+        return any(
+            response.get('status') == 'ok' and response.get('retcode') == 0
+            for response in responses.values()
+        )
     except Exception as e:
         logger.error(f"Error checking group membership: {e}")
         return False
     
 class RejectReason(Enum):
     JOIN_LIMIT = "加群次数过多"  # 新增加群次数限制的原因
+    BLACKLISTED = "已被永久拉黑"
 
 def check_quit_history(user_id: int) -> Tuple[bool, Optional[str]]:
     join_count = group_record.get_user_join_count(user_id)
@@ -132,7 +146,8 @@ def _notify_admin(data: RequestData, reason_type: NotifyReason, custom_msg: str
     elif reason_type == NotifyReason.LEVEL_CHECK_FAILED:
         base_info += "\n说明: 无法通过 API 获取用户等级信息"
     
-    send_group_msg(admin_group, base_info)
+    # 管理员通知优先发送，短时间内的多条通知合并为一条
+    queue_group_msg(admin_group, base_info, priority=MessagePriority.HIGH, coalesce=True)
     logger.info(f"Admin notification sent: {base_info}")
 
 def _reject_request(data: RequestData, reason: str) -> None:
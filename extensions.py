@@ -1,10 +1,12 @@
 from flask import Flask
+from flask_sock import Sock  # 新增依赖: pip install flask-sock
 import logging
 from logging.handlers import TimedRotatingFileHandler
 import os
 from utils.config_manager import load_config
 
 app = Flask(__name__)
+sock = Sock(app)
 config = None
 
 # 创建全局 logger
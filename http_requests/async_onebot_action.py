@@ -0,0 +1,157 @@
+import asyncio
+import threading
+import aiohttp  # 新增依赖: pip install aiohttp
+from typing import Dict, Any, Optional, Callable, Awaitable, Iterable
+from extensions import logger, config
+from utils.background_loop import BackgroundLoop
+from http_requests.onebot_action import get_client
+from utils.onebot_ws import ws_registry, ActionNotSentError, is_read_only_action
+
+class AsyncOneBotClient:
+    """
+    异步 OneBot 动作客户端
+
+    所有请求在同一个后台事件循环中执行，通过信号量限制并发数，
+    用于对多个群同时发起请求
+    """
+
+    def __init__(self, base_url: str, token: str, connect_timeout: float = 3,
+                 read_timeout: float = 30, pool_size: int = 16, max_concurrency: int = 8):
+        self.base_url = base_url.rstrip('/')
+        self.headers = {'Authorization': f'Bearer {token}'}
+        self.timeout = aiohttp.ClientTimeout(connect=connect_timeout, sock_read=read_timeout)
+        self.pool_size = pool_size
+        self.max_concurrency = max(1, max_concurrency)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        # 会话和信号量都绑定到后台事件循环，只在该循环内创建
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=self.timeout,
+                connector=aiohttp.TCPConnector(limit=self.pool_size)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    @staticmethod
+    def _query_params(params: Dict[str, Any]) -> Dict[str, str]:
+        """aiohttp 的查询参数只接受字符串和数字"""
+        return {
+            key: str(value).lower() if isinstance(value, bool) else value
+            for key, value in params.items()
+        }
+
+    async def call_action(self, action: str, params: Dict[str, Any], method: str = 'POST',
+                          self_id: Optional[int] = None) -> dict:
+        """
+        异步调用 OneBot 动作，优先使用反向 WebSocket 连接，连接选择和回退规则与 OneBotClient.call_action 一致
+
+        Raises:
+            aiohttp.ClientError: HTTP 请求失败
+            asyncio.TimeoutError: HTTP 请求超时
+            TimeoutError: WebSocket 动作已发出但超时未收到响应(仅非只读动作)
+            ConnectionError: WebSocket 动作已发出但连接中断(仅非只读动作)
+        """
+        session = self._ensure_session()
+        async with self._semaphore:
+            connection = None
+            if ws_registry.connected_bots():
+                if self_id is None:
+                    self_id = await asyncio.to_thread(get_client().forward_bot_id)
+                connection = ws_registry.get(self_id)
+            if connection:
+                try:
+                    return await asyncio.to_thread(connection.call, action, params)
+                except ActionNotSentError as e:
+                    logger.warning(f"WebSocket 动作 {action} 未发出，回退到 HTTP: {str(e)}")
+                except (ConnectionError, TimeoutError) as e:
+                    if not is_read_only_action(action):
+                        raise
+                    logger.warning(f"WebSocket 调用只读动作 {action} 失败，回退到 HTTP: {str(e)}")
+
+            api_url = f"{self.base_url}/{action}"
+            if method == 'GET':
+                request = session.get(api_url, params=self._query_params(params))
+            else:
+                request = session.post(api_url, json=params)
+
+            async with request as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+
+_loop: Optional[BackgroundLoop] = None
+_client: Optional[AsyncOneBotClient] = None
+_init_lock = threading.Lock()
+
+def get_loop() -> BackgroundLoop:
+    global _loop
+    if _loop is None:
+        with _init_lock:
+            if _loop is None:
+                _loop = BackgroundLoop('onebot-async')
+    return _loop
+
+def get_async_client() -> AsyncOneBotClient:
+    """获取全局共享的 AsyncOneBotClient"""
+    global _client
+    if _client is None:
+        with _init_lock:
+            if _client is None:
+                _client = AsyncOneBotClient(
+                    config['forward_api_url'],
+                    config['forward_api_token'],
+                    connect_timeout=config.get('forward_api_connect_timeout', 3),
+                    read_timeout=config.get('forward_api_read_timeout', 30),
+                    pool_size=config.get('forward_api_pool_size', 16),
+                    max_concurrency=config.get('forward_api_max_concurrency', 8)
+                )
+    return _client
+
+async def _safe_call(action: str, params: Dict[str, Any], method: str = 'POST') -> dict:
+    try:
+        return await get_async_client().call_action(action, params, method=method)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error(f"异步调用 {action} 失败: {str(e)}")
+        return {"status": "failed", "message": str(e)}
+
+async def async_get_group_member_info(group_id: int, user_id: int, no_cache: bool = False) -> dict:
+    """异步获取群成员信息"""
+    return await _safe_call('get_group_member_info', {
+        "group_id": group_id,
+        "user_id": user_id,
+        "no_cache": no_cache
+    })
+
+async def async_get_group_member_list(group_id: int) -> dict:
+    """异步获取群成员列表"""
+    return await _safe_call('get_group_member_list', {
+        "group_id": group_id,
+        "no_cache": True
+    }, method='GET')
+
+async def async_get_group_system_msg(group_id: int) -> dict:
+    """异步获取群系统消息"""
+    return await _safe_call('get_group_system_msg', {"group_id": group_id}, method='GET')
+
+def fan_out(func: Callable[..., Awaitable[dict]], group_ids: Iterable[int], *args, **kwargs) -> Dict[int, dict]:
+    """
+    同步接口：对多个群并发执行同一个异步请求
+
+    Args:
+        func: 第一个参数为群号的异步请求函数
+        group_ids: 群号列表
+        *args, **kwargs: 传给 func 的其余参数
+
+    Returns:
+        Dict[int, dict]: 群号 -> API响应结果，保持 group_ids 的顺序
+    """
+    group_ids = list(group_ids)
+
+    async def _gather():
+        return await asyncio.gather(*(func(gid, *args, **kwargs) for gid in group_ids))
+
+    results = get_loop().run_sync(_gather())
+    return dict(zip(group_ids, results))
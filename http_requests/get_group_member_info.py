@@ -1,6 +1,7 @@
 import requests
 from typing import Union
-from extensions import logger, config
+from extensions import logger
+from http_requests.onebot_action import call_action
 
 def get_group_member_info(group_id: int, user_id: int, no_cache: bool = False) -> dict:
     """
@@ -43,9 +44,6 @@ def get_group_member_info(group_id: int, user_id: int, no_cache: bool = False) -
             }
     """
     try:
-        # 从配置中获取API地址
-        api_url = f"{config['forward_api_url']}/get_group_member_info"
-        
         # 构建请求数据
         data = {
             "group_id": group_id,
@@ -53,13 +51,8 @@ def get_group_member_info(group_id: int, user_id: int, no_cache: bool = False) -
             "no_cache": no_cache
         }
         
-        # 发送POST请求
-        headers = {'Authorization': 'Bearer ' + config['forward_api_token']}
-        response = requests.post(api_url, json=data, headers=headers)
-        
-        # 检查响应状态
-        response.raise_for_status()
-        return response.json()
+        # 发送请求
+        return call_action('get_group_member_info', data)
         
     except requests.RequestException as e:
         logger.error(f"获取群成员信息失败: {str(e)}")
@@ -1,6 +1,7 @@
 import requests
 from typing import List
-from extensions import config, logger
+from extensions import logger
+from http_requests.onebot_action import call_action
 
 def get_group_member_list(group_id: int) -> List[dict]:
     """
@@ -30,19 +31,12 @@ def get_group_member_list(group_id: int) -> List[dict]:
         - card_changeable (bool): If card can be modified
     """
     try:
-        api_url = f"{config['forward_api_url']}/get_group_member_list"
-        
         params = {
             "group_id": group_id,
             "no_cache": True
         }
         
-        headers = {
-            "Authorization": f"Bearer {config['forward_api_token']}"
-        }
-        response = requests.get(api_url, params=params, headers=headers)
-        response.raise_for_status()
-        return response.json()
+        return call_action('get_group_member_list', params, method='GET')
         
     except requests.RequestException as e:
         logger.error(f"获取群成员列表失败: {str(e)}")
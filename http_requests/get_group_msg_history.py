@@ -1,6 +1,7 @@
 import requests
 from typing import Optional
-from extensions import logger, config
+from extensions import logger
+from http_requests.onebot_action import call_action
 
 def get_group_msg_history(
     group_id: int,
@@ -21,9 +22,6 @@ def get_group_msg_history(
         dict: API响应结果，包含状态、返回码、数据等信息
     """
     try:
-        # 从配置中获取API地址
-        api_url = f"{config['forward_api_url']}/get_group_msg_history"
-        
         # 构建请求数据
         data = {
             "group_id": group_id,
@@ -32,13 +30,8 @@ def get_group_msg_history(
             "reverseOrder": reverse_order
         }
         
-        # 发送POST请求
-        headers = {'Authorization': 'Bearer ' + config['forward_api_token']}
-        response = requests.post(api_url, json=data, headers=headers)
-        
-        # 检查响应状态
-        response.raise_for_status()
-        return response.json()
+        # 发送请求
+        return call_action('get_group_msg_history', data)
         
     except requests.RequestException as e:
         logger.error(f"获取群消息历史记录失败: {str(e)}")
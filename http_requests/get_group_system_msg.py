@@ -1,6 +1,7 @@
 import requests
 from typing import Dict
-from extensions import logger, config
+from extensions import logger
+from http_requests.onebot_action import call_action
 
 def get_group_system_msg(group_id: int) -> Dict:
     """
@@ -13,21 +14,13 @@ def get_group_system_msg(group_id: int) -> Dict:
         dict: API响应结果
     """
     try:
-        # 从配置中获取API地址
-        api_url = f"{config['forward_api_url']}/get_group_system_msg"
-        
         # 构建请求数据
         data = {
             "group_id": group_id
         }
         
-        # 发送GET请求
-        headers = {'Authorization': f"Bearer {config['forward_api_token']}"}
-        response = requests.get(api_url, params=data, headers=headers)
-        
-        # 检查响应状态
-        response.raise_for_status()
-        return response.json()
+        # 发送请求
+        return call_action('get_group_system_msg', data, method='GET')
         
     except requests.RequestException as e:
         logger.error(f"获取群系统消息失败: {str(e)}")
@@ -1,5 +1,6 @@
 import requests
-from extensions import config, logger
+from extensions import logger
+from http_requests.onebot_action import call_action
 
 def get_stranger_info(user_id: int, no_cache: bool = False) -> dict:
     """
@@ -20,24 +21,14 @@ def get_stranger_info(user_id: int, no_cache: bool = False) -> dict:
             - login_days (int): 登录天数
     """
     try:
-        # 从配置中获取API地址
-        api_url = f"{config['forward_api_url']}/get_stranger_info"
-        
         # 构建请求数据
         params = {
             "user_id": user_id,
             "no_cache": no_cache
         }
         
-        # 发送GET请求
-        headers = {
-            'Authorization': f'Bearer {config["forward_api_token"]}'
-        }
-        response = requests.get(api_url, params=params, headers=headers)
-        
-        # 检查响应状态
-        response.raise_for_status()
-        return response.json()
+        # 发送请求
+        return call_action('get_stranger_info', params, method='GET')
         
     except requests.RequestException as e:
         logger.error(f"获取陌生人信息失败: {str(e)}")
@@ -0,0 +1,121 @@
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Optional
+from extensions import logger, config
+from utils.onebot_ws import ws_registry, ActionNotSentError, is_read_only_action
+
+class OneBotClient:
+    """
+    OneBot 动作客户端
+
+    持有一个带连接池的 keep-alive 会话，所有 http_requests 模块共用，
+    鉴权头只在创建会话时构建一次
+    """
+
+    def __init__(self, base_url: str, token: str, connect_timeout: float = 3,
+                 read_timeout: float = 30, pool_size: int = 16):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Authorization': f'Bearer {token}'})
+
+        self._forward_bot_id: Optional[int] = None
+        self._forward_bot_retry_at = 0.0
+        self._forward_bot_lock = threading.Lock()
+
+    def forward_bot_id(self) -> Optional[int]:
+        """
+        forward_api_url 背后的机器人QQ号
+
+        优先读取 forward_bot_id 配置，未配置时通过 HTTP 调用 get_login_info 查询一次并缓存，
+        查询失败时 60 秒内不再重试
+        """
+        configured = config.get('forward_bot_id')
+        if configured:
+            return int(configured)
+        with self._forward_bot_lock:
+            if self._forward_bot_id is None and time.monotonic() >= self._forward_bot_retry_at:
+                try:
+                    response = self.session.post(f"{self.base_url}/get_login_info", json={}, timeout=self.timeout)
+                    response.raise_for_status()
+                    self._forward_bot_id = int(response.json()['data']['user_id'])
+                except (requests.RequestException, KeyError, TypeError, ValueError) as e:
+                    self._forward_bot_retry_at = time.monotonic() + 60
+                    logger.warning(f"查询转发接口的机器人账号失败，暂时只使用 HTTP: {str(e)}")
+            return self._forward_bot_id
+
+    def call_action(self, action: str, params: Dict[str, Any], method: str = 'POST',
+                    self_id: Optional[int] = None) -> dict:
+        """
+        调用 OneBot 动作
+
+        优先通过反向 WebSocket 长连接发送。只使用 self_id 指定的机器人的连接，未指定时使用
+        forward_api_url 背后的同一个账号，保证两条通道由同一个机器人执行动作。
+        没有可用连接或动作帧未发出时回退到 HTTP；
+        动作帧已发出但超时或连接中断时，OneBot 可能已经执行了该动作，
+        只有只读的 get_* 动作会回退，其他动作直接抛出，避免重复发消息、踢人等
+
+        Args:
+            action (str): 动作名称
+            params (dict): 动作参数
+            method (str, optional): HTTP 回退时使用的请求方法. Defaults to 'POST'.
+            self_id (Optional[int], optional): 指定使用的机器人，未指定时为转发接口的机器人. Defaults to None.
+
+        Returns:
+            dict: API响应结果
+
+        Raises:
+            requests.RequestException: HTTP 请求失败
+            TimeoutError: WebSocket 动作已发出但超时未收到响应(仅非只读动作)
+            ConnectionError: WebSocket 动作已发出但连接中断(仅非只读动作)
+        """
+        connection = None
+        if ws_registry.connected_bots():
+            connection = ws_registry.get(self_id if self_id is not None else self.forward_bot_id())
+        if connection:
+            try:
+                return connection.call(action, params)
+            except ActionNotSentError as e:
+                logger.warning(f"WebSocket 动作 {action} 未发出，回退到 HTTP: {str(e)}")
+            except (ConnectionError, TimeoutError) as e:
+                if not is_read_only_action(action):
+                    raise
+                logger.warning(f"WebSocket 调用只读动作 {action} 失败，回退到 HTTP: {str(e)}")
+
+        api_url = f"{self.base_url}/{action}"
+        if method == 'GET':
+            response = self.session.get(api_url, params=params, timeout=self.timeout)
+        else:
+            response = self.session.post(api_url, json=params, timeout=self.timeout)
+
+        response.raise_for_status()
+        return response.json()
+
+_client: Optional[OneBotClient] = None
+_client_lock = threading.Lock()
+
+def get_client() -> OneBotClient:
+    """获取全局共享的 OneBotClient"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OneBotClient(
+                    config['forward_api_url'],
+                    config['forward_api_token'],
+                    connect_timeout=config.get('forward_api_connect_timeout', 3),
+                    read_timeout=config.get('forward_api_read_timeout', 30),
+                    pool_size=config.get('forward_api_pool_size', 16)
+                )
+    return _client
+
+def call_action(action: str, params: Dict[str, Any], method: str = 'POST',
+                self_id: Optional[int] = None) -> dict:
+    """通过全局共享的 OneBotClient 调用动作"""
+    return get_client().call_action(action, params, method=method, self_id=self_id)
@@ -1,6 +1,7 @@
 import requests
 from typing import List, Dict, Union
-from extensions import logger, config
+from extensions import logger
+from http_requests.onebot_action import call_action
 
 def send_group_forward_msg(
     group_id: int,
@@ -25,9 +26,6 @@ def send_group_forward_msg(
         dict: API响应结果
     """
     try:
-        # 从配置中获取API地址
-        api_url = f"{config['forward_api_url']}/send_group_forward_msg"
-        
         # 构建请求数据
         data = {
             "group_id": group_id,
@@ -44,14 +42,9 @@ def send_group_forward_msg(
         if source:
             data["source"] = source
             
-        # 发送POST请求
-        headers = {'Authorization': 'Bearer ' + config['forward_api_token']}
-        response = requests.post(api_url, json=data, headers=headers)
-        
-        # 检查响应状态
-        response.raise_for_status()
-        return response.json()
+        # 发送请求
+        return call_action('send_group_forward_msg', data)
         
-    except requests.RequestException as e:
+    except (requests.RequestException, TimeoutError, ConnectionError) as e:
         logger.error(f"发送群合并转发消息失败: {str(e)}")
         return {"status": "failed", "message": str(e)}
\ No newline at end of file
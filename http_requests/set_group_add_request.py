@@ -1,6 +1,7 @@
 import requests
 from typing import Optional
-from extensions import config, logger
+from extensions import logger
+from http_requests.onebot_action import call_action
 from http_requests.send_group_msg import send_group_msg
 
 def set_group_add_request(
@@ -25,9 +26,6 @@ def set_group_add_request(
         dict: API响应结果
     """
     try:
-        # 从配置中获取API地址
-        api_url = f"{config['forward_api_url']}/set_group_add_request"
-        
         # 构建请求数据
         data = {
             "flag": flag,
@@ -39,15 +37,9 @@ def set_group_add_request(
         if not approve and reason:
             data["reason"] = reason
             
-        # 发送POST请求
-        headers = {'Authorization': 'Bearer ' + config['forward_api_token']}
-        response = requests.post(api_url, json=data, headers=headers)
-        
-        # 检查响应状态
-        response.raise_for_status()
-
-        return response.json()
+        # 发送请求
+        return call_action('set_group_add_request', data)
         
-    except requests.RequestException as e:
+    except (requests.RequestException, TimeoutError, ConnectionError) as e:
         logger.error(f"处理加群请求失败: {str(e)}")
         return {"status": "failed", "message": str(e)}
\ No newline at end of file
@@ -1,6 +1,7 @@
 import requests
 from typing import Union
-from extensions import logger, config
+from extensions import logger
+from http_requests.onebot_action import call_action
 
 def set_group_ban(group_id: int, user_id: int, duration: int = 1800) -> dict:
     """
@@ -15,9 +16,6 @@ def set_group_ban(group_id: int, user_id: int, duration: int = 1800) -> dict:
         dict: API响应结果
     """
     try:
-        # 从配置中获取API地址
-        api_url = f"{config['forward_api_url']}/set_group_ban"
-        
         # 构建请求数据
         data = {
             "group_id": group_id,
@@ -25,14 +23,9 @@ def set_group_ban(group_id: int, user_id: int, duration: int = 1800) -> dict:
             "duration": duration
         }
         
-        # 发送POST请求
-        headers = {'Authorization': 'Bearer ' + config['forward_api_token']}
-        response = requests.post(api_url, json=data, headers=headers)
-        
-        # 检查响应状态
-        response.raise_for_status()
-        return response.json()
+        # 发送请求
+        return call_action('set_group_ban', data)
         
-    except requests.RequestException as e:
+    except (requests.RequestException, TimeoutError, ConnectionError) as e:
         logger.error(f"设置群禁言失败: {str(e)}")
         return {"status": "failed", "message": str(e)}
\ No newline at end of file
@@ -1,9 +1,16 @@
-from typing import Dict
+import re
+import unicodedata
+from typing import Dict, Optional
 from .gemini import GeminiAPI, GeminiConfig
 from .pool import sync_execute_request, execute_request
+from .cache import make_key
 from extensions import config, logger
-from functools import lru_cache
-import json
+from sqlite import audit_cache
+
+# 审核结果持久化缓存的默认有效期(秒)
+AUDIT_CACHE_TTL = 7 * 24 * 3600
+
+_WHITESPACE = re.compile(r"\s+")
 
 class AuditService:
     def __init__(self):
@@ -34,34 +41,59 @@ class AuditService:
         }
 
     @staticmethod
-    def _get_cache_key(message: str, schema: dict, system_prompt: str) -> str:
-        """生成可哈希的缓存键"""
-        cache_data = {
-            'message': message,
-            'schema': json.dumps(schema, sort_keys=True),
-            'system_prompt': system_prompt
-        }
-        return json.dumps(cache_data, sort_keys=True)
+    def _normalize(message: str) -> str:
+        """统一全半角、大小写和空白，使仅有格式差异的答案命中同一条缓存"""
+        message = unicodedata.normalize('NFKC', message or '').casefold()
+        return _WHITESPACE.sub(' ', message).strip()
+
+    def _verdict_key(self, message: str, system_prompt: str) -> str:
+        """
+        持久化缓存键: 规范化后的申请信息 + 系统提示词版本 + schema + 模型
 
-    @lru_cache(maxsize=100)
-    def _cached_audit_impl(self, cache_key: str) -> Dict:
-        """实际的缓存实现"""
-        cache_data = json.loads(cache_key)
-        return sync_execute_request(
-            self.gemini_api.chat_json,
-            cache_data['message'],
-            json.loads(cache_data['schema']),
-            system_prompt=cache_data['system_prompt']
+        未配置 audits_ai_system_prompt_version 时以提示词全文作为版本，提示词修改后旧结果自动失效
+        """
+        return make_key(
+            comment=self._normalize(message),
+            prompt_version=config.get('audits_ai_system_prompt_version') or system_prompt,
+            schema=self.schema,
+            model=self.gemini_api.config.model_name
         )
 
+    def _load_verdict(self, cache_key: str) -> Optional[Dict]:
+        try:
+            return audit_cache.get_verdict(cache_key)
+        except Exception as e:
+            logger.warning(f"读取审核结果缓存失败: {e}")
+            return None
+
+    def _save_verdict(self, cache_key: str, verdict: Dict) -> None:
+        # 只持久化符合 schema 的结果，避免把异常响应固化下来
+        if not isinstance(verdict, dict) or 'agreed' not in verdict:
+            return
+        try:
+            audit_cache.save_verdict(cache_key, verdict, config.get('audit_cache_ttl', AUDIT_CACHE_TTL))
+        except Exception as e:
+            logger.warning(f"保存审核结果缓存失败: {e}")
+
     def _cached_audit(self, message: str) -> Dict:
-        """缓存相同的审核请求"""
-        cache_key = self._get_cache_key(
+        """
+        先查持久化缓存，未命中再请求模型；
+        请求池的共享响应缓存在进程内对完全相同的请求再做一层去重
+        """
+        system_prompt = config['audits_ai_system_prompt']
+        cache_key = self._verdict_key(message, system_prompt)
+        verdict = self._load_verdict(cache_key)
+        if verdict is not None:
+            return verdict
+
+        verdict = sync_execute_request(
+            self.gemini_api.achat_json,
             message,
             self.schema,
-            config['audits_ai_system_prompt']
+            system_prompt=system_prompt
         )
-        return self._cached_audit_impl(cache_key)
+        self._save_verdict(cache_key, verdict)
+        return verdict
 
     def audit_join_request(self, message: str) -> Dict:
         """
@@ -78,12 +110,20 @@ class AuditService:
         异步审核请求处理
         """
         try:
-            return await execute_request(
-                self.gemini_api.chat_json,
-                message, 
-                self.schema, 
-                system_prompt=config['audits_ai_system_prompt']
+            system_prompt = config['audits_ai_system_prompt']
+            cache_key = self._verdict_key(message, system_prompt)
+            verdict = self._load_verdict(cache_key)
+            if verdict is not None:
+                return verdict
+
+            verdict = await execute_request(
+                self.gemini_api.achat_json,
+                message,
+                self.schema,
+                system_prompt=system_prompt
             )
+            self._save_verdict(cache_key, verdict)
+            return verdict
         except Exception as e:
             logger.error(f"Error during async join request audit: {e}")
             raise
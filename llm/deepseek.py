@@ -6,6 +6,7 @@ from typing import List, Dict, Any, Optional, Union, AsyncGenerator, Callable
 from dataclasses import dataclass, field
 from tenacity import retry, stop_after_attempt, wait_exponential, before_log, after_log
 from extensions import logger, config
+from .loop import run_sync
 
 @dataclass
 class DeepseekConfig:
@@ -291,4 +292,4 @@ class DeepseekAPI:
 
     def chat(self, prompt: str, history: Optional[List[Dict[str, Any]]] = None) -> Union[str, AsyncGenerator[str, None]]:
         """同步聊天方法的包装器"""
-        return asyncio.run(self.achat(prompt, history))
\ No newline at end of file
+        return run_sync(self.achat(prompt, history))
\ No newline at end of file
@@ -2,9 +2,11 @@ import google.generativeai as genai
 from typing import List, Dict, Any, Optional, Union
 import asyncio
 import json
+import threading
 from tenacity import retry, stop_after_attempt, wait_exponential
 from dataclasses import dataclass
 from extensions import logger, config
+from .loop import run_sync
 
 @dataclass
 class GeminiConfig:
@@ -17,6 +19,42 @@ class GeminiAPIError(Exception):
     """自定义Gemini API异常类"""
     pass
 
+# 进程级模型注册表: genai.configure 是全局设置，只在 api_key 变化时调用一次；
+# GenerativeModel 按 (模型名, 系统提示词, 生成配置) 缓存复用
+_configured_api_key: Optional[str] = None
+_models: Dict[tuple, genai.GenerativeModel] = {}
+_registry_lock = threading.Lock()
+
+def configure_api_key(api_key: str) -> None:
+    """配置全局 API key，相同的 key 不会重复配置"""
+    global _configured_api_key
+    with _registry_lock:
+        if _configured_api_key != api_key:
+            genai.configure(api_key=api_key)
+            _configured_api_key = api_key
+            _models.clear()
+
+def get_model(model_name: str, system_instruction: Optional[str] = None,
+              generation_config: Optional[Dict[str, Any]] = None) -> genai.GenerativeModel:
+    """获取已配置的模型实例，同样的参数只构建一次"""
+    key = (
+        model_name,
+        system_instruction or None,
+        json.dumps(generation_config, sort_keys=True) if generation_config else None
+    )
+    model = _models.get(key)
+    if model is None:
+        with _registry_lock:
+            model = _models.get(key)
+            if model is None:
+                model = genai.GenerativeModel(
+                    model_name=model_name,
+                    generation_config=generation_config,
+                    system_instruction=system_instruction or None
+                )
+                _models[key] = model
+    return model
+
 class GeminiAPI:
     def __init__(self, app=None, config: Optional[GeminiConfig] = None) -> None:
         self.config = config
@@ -54,11 +92,8 @@ class GeminiAPI:
             if not self.config.api_key:
                 raise GeminiAPIError("API key not properly initialized")
             
-            # 配置代理
-            genai.configure(
-                api_key=self.config.api_key,
-            )
-            self.model = genai.GenerativeModel(model_name=self.config.model_name)
+            configure_api_key(self.config.api_key)
+            self.model = get_model(self.config.model_name)
             logger.info("Gemini API initialized successfully")
         except Exception as e:
             logger.error(f"Failed to setup Gemini API: {str(e)}")
@@ -76,10 +111,7 @@ class GeminiAPI:
             raise GeminiAPIError("Gemini model not initialized")
         
         try:
-            model = genai.GenerativeModel(
-                model_name=self.config.model_name,
-                system_instruction=system_prompt if system_prompt else None
-            )
+            model = get_model(self.config.model_name, system_instruction=system_prompt)
             chat = model.start_chat(history=history or [])
             response = await asyncio.to_thread(chat.send_message, prompt)
             
@@ -96,7 +128,7 @@ class GeminiAPI:
     def chat(self, prompt: str, history: Optional[List[Dict[str, Any]]] = None,
             system_prompt: str = "") -> str:
         """同步聊天方法"""
-        return asyncio.run(self.achat(prompt, history, system_prompt))
+        return run_sync(self.achat(prompt, history, system_prompt))
 
     async def achat_json(self, prompt: str, schema: Dict[str, Any],
                         history: Optional[List[Dict[str, Any]]] = None,
@@ -110,10 +142,10 @@ class GeminiAPI:
                 "response_schema": schema,
                 "response_mime_type": "application/json"
             }
-            model = genai.GenerativeModel(
-                model_name=self.config.model_name,
-                generation_config=generation_config,
-                system_instruction=system_prompt if system_prompt else None
+            model = get_model(
+                self.config.model_name,
+                system_instruction=system_prompt,
+                generation_config=generation_config
             )
             chat = model.start_chat(history=history or [])
             response = await asyncio.to_thread(chat.send_message, prompt)
@@ -131,7 +163,25 @@ class GeminiAPI:
                  history: Optional[List[Dict[str, Any]]] = None,
                  system_prompt: str = "") -> Dict[str, Any]:
         """同步JSON响应聊天方法"""
-        return asyncio.run(self.achat_json(prompt, schema, history, system_prompt))
+        return run_sync(self.achat_json(prompt, schema, history, system_prompt))
+
+_shared_api: Optional[GeminiAPI] = None
+_shared_api_lock = threading.Lock()
+
+def get_gemini_api() -> GeminiAPI:
+    """获取按全局配置创建的共享 GeminiAPI 实例"""
+    global _shared_api
+    if _shared_api is None:
+        with _shared_api_lock:
+            if _shared_api is None:
+                api_key = config.get('gemini_api_key')
+                if not api_key:
+                    raise GeminiAPIError("gemini_api_key not found in config")
+                _shared_api = GeminiAPI(config=GeminiConfig(
+                    api_key=api_key,
+                    model_name=config.get('gemini_model_name', GeminiConfig.model_name)
+                ))
+    return _shared_api
 
 def main():
     # 修改示例用法
@@ -0,0 +1,47 @@
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional
+from extensions import config
+from utils.background_loop import BackgroundLoop
+
+# 同步等待 LLM 调用的默认超时(秒)，可通过 llm_call_timeout 配置，0 表示不限时
+DEFAULT_CALL_TIMEOUT = 120
+
+_loop: Optional[BackgroundLoop] = None
+_loop_lock = threading.Lock()
+
+def get_llm_loop() -> BackgroundLoop:
+    """
+    获取 LLM 专用的常驻事件循环
+
+    所有大模型 I/O 都在这个循环中执行，限流器、缓存和连接只绑定这一个循环
+    """
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                _loop = BackgroundLoop('llm-async')
+    return _loop
+
+def in_llm_loop() -> bool:
+    """当前是否运行在 LLM 事件循环中"""
+    try:
+        return asyncio.get_running_loop() is get_llm_loop().loop
+    except RuntimeError:
+        return False
+
+def run_sync(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """
+    供 Flask 处理线程等同步代码调用: 在 LLM 事件循环中执行协程并等待结果
+
+    timeout 为空时使用 llm_call_timeout 配置；超时后协程被取消，并抛出 TimeoutError
+    """
+    if timeout is None:
+        timeout = config.get('llm_call_timeout', DEFAULT_CALL_TIMEOUT) or None
+    return get_llm_loop().run_sync(coro, timeout)
+
+async def run_in_llm_loop(coro: Coroutine) -> Any:
+    """在其他事件循环中等待协程，协程本身转到 LLM 事件循环执行"""
+    if in_llm_loop():
+        return await coro
+    return await asyncio.wrap_future(get_llm_loop().submit(coro))
@@ -1,61 +1,134 @@
 import time
 import asyncio
-import json
-from functools import lru_cache
-from typing import Callable, Any
-from collections import deque
+import threading
+from typing import Callable, Any, Dict, Tuple
+from extensions import config
+from .cache import ResponseCache, make_key, response_cache
+from .loop import run_in_llm_loop, run_sync
+
+_MISSING = object()
+
+def _check_rpm(rpm: int) -> None:
+    if not rpm or rpm <= 0:
+        raise ValueError(f"rpm 必须大于 0: {rpm}")
+
+class RateLimiter:
+    """
+    令牌桶限流器，附带最大并发数限制
+
+    令牌按 rpm 匀速补充，桶容量为 burst；请求先预约令牌再等待，等待期间不会阻塞其他请求。
+    只在 LLM 事件循环中使用，预约令牌不跨越 await，无需加锁
+    """
+
+    def __init__(self, rpm: int = 10, max_concurrency: int = 4, burst: int = 1):
+        _check_rpm(rpm)
+        self.rpm = rpm
+        self.burst = max(1, burst)
+        self.max_concurrency = max(1, max_concurrency)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    @property
+    def rate(self) -> float:
+        """每秒补充的令牌数"""
+        return self.rpm / 60.0
+
+    def _reserve(self) -> float:
+        """预约一个令牌，返回需要等待的秒数"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await self._semaphore.acquire()
+
+    def release(self) -> None:
+        self._semaphore.release()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
 
 class RequestPool:
     _instance = None
-    _lock = asyncio.Lock()
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self, rpm_limit: int = 10, cache_size: int = 100):
+    def __init__(self, rpm_limit: int = 10, max_concurrency: int = 4, cache: ResponseCache = None):
         if not hasattr(self, 'initialized'):
             self.rpm_limit = rpm_limit
-            self.interval = 60.0 / rpm_limit
-            self.last_request_time = 0.0
-            self.request_queue = deque()
-            self.cache_size = cache_size
-            self._cache = {}
+            self.max_concurrency = max_concurrency
+            self.cache = cache or response_cache
+            self._limiters: Dict[Tuple[str, str], RateLimiter] = {}
+            self._limiters_lock = threading.Lock()
             self.initialized = True
 
     @staticmethod
-    def _get_cache_key(func, *args, **kwargs) -> str:
-        """生成可哈希的缓存键"""
-        cache_data = {
-            'func_name': func.__name__,
-            'args': str(args),
-            'kwargs': str(sorted(kwargs.items()))
-        }
-        return json.dumps(cache_data, sort_keys=True)
+    def _limit_key(func: Callable) -> Tuple[str, str]:
+        """根据调用对象推断 (服务商, 模型)，例如 GeminiAPI 实例方法 -> ('gemini', 模型名)"""
+        owner = getattr(func, '__self__', None)
+        if owner is None:
+            return ('default', func.__name__)
+        provider = type(owner).__name__.lower().replace('api', '') or 'default'
+        model = getattr(getattr(owner, 'config', None), 'model_name', '') or ''
+        return (provider, model)
+
+    def _limit_settings(self, provider: str, model: str) -> Dict[str, Any]:
+        """
+        读取 llm_rate_limits 配置，按 "服务商:模型" -> "服务商" -> "default" 的顺序查找
+        """
+        settings = {'rpm': self.rpm_limit, 'max_concurrency': self.max_concurrency, 'burst': 1}
+        limits = config.get('llm_rate_limits', {})
+        for key in ('default', provider, f'{provider}:{model}'):
+            settings.update(limits.get(key, {}))
+        return settings
+
+    def get_limiter(self, func: Callable) -> RateLimiter:
+        key = self._limit_key(func)
+        with self._limiters_lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = RateLimiter(**self._limit_settings(*key))
+                self._limiters[key] = limiter
+            return limiter
+
+    def _get_cache_key(self, func: Callable, *args, **kwargs) -> str:
+        """按 (服务商, 模型, 方法, 参数) 生成 sha256 缓存键，参数包含 prompt、schema 与 system_prompt"""
+        provider, model = self._limit_key(func)
+        return make_key(
+            provider=provider,
+            model=model,
+            func=func.__name__,
+            args=args,
+            kwargs=kwargs
+        )
 
     async def _cached_execute(self, func: Callable, *args, **kwargs) -> Any:
-        """使用字符串作为缓存键"""
         cache_key = self._get_cache_key(func, *args, **kwargs)
-        if cache_key not in self._cache:
-            self._cache[cache_key] = await self._execute(func, *args, **kwargs)
-        return self._cache[cache_key]
+        result = self.cache.get(cache_key, _MISSING)
+        if result is _MISSING:
+            result = await self._execute(func, *args, **kwargs)
+            self.cache.set(cache_key, result)
+        return result
 
     async def _execute(self, func: Callable, *args, **kwargs) -> Any:
-        async with self._lock:
-            current_time = time.time()
-            time_since_last_request = current_time - self.last_request_time
-            
-            if time_since_last_request < self.interval:
-                await asyncio.sleep(self.interval - time_since_last_request)
-            
+        async with self.get_limiter(func):
             try:
                 if asyncio.iscoroutinefunction(func):
-                    result = await func(*args, **kwargs)
-                else:
-                    result = await asyncio.to_thread(func, *args, **kwargs)
-                self.last_request_time = time.time()
-                return result
+                    return await func(*args, **kwargs)
+                return await asyncio.to_thread(func, *args, **kwargs)
             except Exception as e:
                 raise Exception(f"Error executing request: {str(e)}")
 
@@ -70,13 +143,16 @@ class RequestPool:
 global_request_pool = RequestPool(rpm_limit=10)
 
 async def execute_request(func: Callable, *args, **kwargs) -> Any:
-    """异步执行请求的便捷函数"""
-    return await global_request_pool.execute(func, *args, **kwargs)
+    """异步执行请求的便捷函数，请求总是在 LLM 事件循环中执行"""
+    return await run_in_llm_loop(global_request_pool.execute(func, *args, **kwargs))
 
 def sync_execute_request(func: Callable, *args, **kwargs) -> Any:
-    """同步执行请求的便捷函数"""
-    return asyncio.run(execute_request(func, *args, **kwargs))
+    """同步执行请求的便捷函数，阻塞等待 LLM 事件循环返回结果"""
+    return run_sync(global_request_pool.execute(func, *args, **kwargs))
 
 def set_rpm_limit(rpm: int):
+    """修改默认 RPM，同时作用于已创建的限流器，rpm 必须大于 0"""
+    _check_rpm(rpm)
     global_request_pool.rpm_limit = rpm
-    global_request_pool.interval = 60.0 / rpm
\ No newline at end of file
+    for limiter in list(global_request_pool._limiters.values()):
+        limiter.rpm = rpm
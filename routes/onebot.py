@@ -1,10 +1,23 @@
-import threading
+import hmac
+import json
 from flask import Blueprint, request, jsonify
-from extensions import app, config, logger
+from extensions import app, sock, config, logger
 from events import onebot
+from utils.event_dispatcher import EventDispatcher
+from utils.onebot_ws import OneBotConnection, ws_registry
+from llm.cache import response_cache
+from utils.scheduler import scheduler
+from utils.send_queue import send_queue
 
 onebot_bp = Blueprint('onebot', __name__)
 
+# 按 group_id 分配的有序事件处理通道
+dispatcher = EventDispatcher(
+    onebot.handle_event,
+    max_workers=config.get('event_workers', 8),
+    max_queue_size=config.get('event_queue_size', 256)
+)
+
 @onebot_bp.route('/', methods=['POST'])
 def handle_onebot_event():
     # 验证请求内容类型
@@ -41,11 +54,76 @@ def handle_onebot_event():
             'message': f'机器人ID {self_id} 未配置'
         }), 403
 
-    # 创建新线程处理事件
-    threading.Thread(
-        target=onebot.handle_event,
-        args=(data,),
-        daemon=True
-    ).start()
+    # 提交到事件队列，队列饱和时返回503
+    if not dispatcher.submit(data):
+        logger.warning(f'事件队列已饱和，拒绝事件: {data.get("post_type")}')
+        return jsonify({
+            'status': 'failed',
+            'message': '服务繁忙，事件队列已满'
+        }), 503
+
+    return '', 200
+
+@sock.route('/ws', bp=onebot_bp)
+def handle_onebot_ws(ws):
+    """反向 WebSocket 连接，事件上报和动作调用共用同一条长连接"""
+    try:
+        self_id = int(request.headers.get('X-Self-ID', ''))
+    except ValueError:
+        logger.warning(f'拒绝 X-Self-ID 无效的 WebSocket 连接: {request.headers.get("X-Self-ID")}')
+        return
+    if self_id not in config.get('bot_accounts', []):
+        logger.warning(f'拒绝未配置机器人的 WebSocket 连接: {self_id}')
+        return
+
+    # 校验访问令牌，总是要求令牌，否则任何客户端都能冒充机器人顶替已有连接
+    token = config.get('ws_access_token') or config.get('forward_api_token')
+    if not token:
+        logger.warning(f'未配置 ws_access_token 或 forward_api_token，拒绝机器人 {self_id} 的 WebSocket 连接')
+        return
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        logger.warning(f'机器人 {self_id} 的 WebSocket 访问令牌无效')
+        return
+
+    connection = OneBotConnection(self_id, ws)
+    ws_registry.register(connection)
+    try:
+        while True:
+            raw = ws.receive()
+            if raw is None:
+                continue
+
+            try:
+                data = json.loads(raw)
+            except (TypeError, ValueError):
+                logger.debug(f'收到无效的 WebSocket 数据: {raw}')
+                continue
+
+            # 动作响应，按 echo 交还给调用方
+            if 'post_type' not in data:
+                if not connection.resolve(data):
+                    logger.debug(f'未匹配的动作响应: {data.get("echo")}')
+                continue
+
+            if data.get('post_type') == 'meta_event':
+                continue
+
+            if not dispatcher.submit(data):
+                logger.warning(f'事件队列已饱和，丢弃 WebSocket 事件: {data.get("post_type")}')
+    except Exception as e:
+        logger.info(f'机器人 {self_id} 的 WebSocket 连接结束: {str(e)}')
+    finally:
+        ws_registry.unregister(connection)
 
-    return '', 200
\ No newline at end of file
+@onebot_bp.route('/status', methods=['GET'])
+def dispatcher_status():
+    return jsonify({
+        'status': 'success',
+        'data': dict(
+            dispatcher.stats(),
+            ws_connections=ws_registry.connected_bots(),
+            llm_cache=response_cache.stats(),
+            scheduled_jobs=scheduler.pending(),
+            send_queue=send_queue.stats()
+        )
+    })
\ No newline at end of file
@@ -0,0 +1,45 @@
+import json
+import time
+from typing import Optional
+from .database import get_connection
+
+SELECT_SQL = "SELECT verdict FROM audit_cache WHERE cache_key = ? AND expires_at > ?"
+UPSERT_SQL = (
+    "INSERT OR REPLACE INTO audit_cache (cache_key, verdict, created_at, expires_at) "
+    "VALUES (?, ?, ?, ?)"
+)
+DELETE_EXPIRED_SQL = "DELETE FROM audit_cache WHERE expires_at <= ?"
+DELETE_ALL_SQL = "DELETE FROM audit_cache"
+
+def get_verdict(cache_key: str) -> Optional[dict]:
+    """读取未过期的审核结果，不存在或已过期返回 None"""
+    row = get_connection().execute(SELECT_SQL, (cache_key, int(time.time()))).fetchone()
+    if not row:
+        return None
+    return json.loads(row[0])
+
+def save_verdict(cache_key: str, verdict: dict, ttl: int) -> None:
+    """
+    保存审核结果
+
+    Args:
+        cache_key: 缓存键
+        verdict: 审核结果
+        ttl: 有效期(秒)
+    """
+    now = int(time.time())
+    conn = get_connection()
+    with conn:
+        conn.execute(UPSERT_SQL, (cache_key, json.dumps(verdict, ensure_ascii=False), now, now + ttl))
+
+def purge_expired() -> int:
+    """删除已过期的审核结果，返回删除的条数"""
+    conn = get_connection()
+    with conn:
+        return conn.execute(DELETE_EXPIRED_SQL, (int(time.time()),)).rowcount
+
+def clear() -> int:
+    """清空审核结果缓存，返回删除的条数"""
+    conn = get_connection()
+    with conn:
+        return conn.execute(DELETE_ALL_SQL).rowcount
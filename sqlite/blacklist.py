@@ -0,0 +1,90 @@
+import threading
+import time
+from typing import Dict, Optional
+from .database import get_connection
+
+UPSERT_SQL = (
+    "INSERT OR REPLACE INTO blacklist (qq, reason, operator_id, created_at, expires_at) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+DELETE_SQL = "DELETE FROM blacklist WHERE qq = ?"
+SELECT_ALL_SQL = "SELECT qq, expires_at FROM blacklist"
+SELECT_ONE_SQL = "SELECT qq, reason, operator_id, created_at, expires_at FROM blacklist WHERE qq = ?"
+
+# 内存中的黑名单: qq -> 过期时间戳(None 表示永久)
+_entries: Dict[int, Optional[int]] = {}
+_lock = threading.Lock()
+_loaded = False
+
+def load_blacklist() -> int:
+    """从数据库加载黑名单到内存，返回加载的条目数"""
+    global _loaded
+    rows = get_connection().execute(SELECT_ALL_SQL).fetchall()
+    with _lock:
+        _entries.clear()
+        _entries.update({qq: expires_at for qq, expires_at in rows})
+        _loaded = True
+    return len(rows)
+
+def _ensure_loaded() -> None:
+    if not _loaded:
+        load_blacklist()
+
+def add_to_blacklist(qq: int, reason: str = "", operator_id: Optional[int] = None,
+                     expires_at: Optional[int] = None) -> None:
+    """
+    拉黑用户
+
+    Args:
+        qq: 用户QQ号
+        reason: 拉黑原因
+        operator_id: 操作人QQ号
+        expires_at: 过期时间戳，None 表示永久
+    """
+    _ensure_loaded()
+    conn = get_connection()
+    with conn:
+        conn.execute(UPSERT_SQL, (qq, reason, operator_id, int(time.time()), expires_at))
+    with _lock:
+        _entries[qq] = expires_at
+
+def remove_from_blacklist(qq: int) -> bool:
+    """解除拉黑，返回用户原本是否在黑名单中"""
+    _ensure_loaded()
+    conn = get_connection()
+    with conn:
+        deleted = conn.execute(DELETE_SQL, (qq,)).rowcount
+    with _lock:
+        _entries.pop(qq, None)
+    return deleted > 0
+
+def is_blacklisted(qq: int) -> bool:
+    """检查用户是否在黑名单中，仅查询内存"""
+    _ensure_loaded()
+    with _lock:
+        if qq not in _entries:
+            return False
+        expires_at = _entries[qq]
+    if expires_at is not None and expires_at <= time.time():
+        remove_from_blacklist(qq)
+        return False
+    return True
+
+def format_expiry(expires_at: Optional[int]) -> str:
+    """格式化过期时间，None 表示永久"""
+    if expires_at is None:
+        return "永久"
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(expires_at))
+
+def get_blacklist_entry(qq: int) -> Optional[dict]:
+    """获取黑名单条目详情"""
+    row = get_connection().execute(SELECT_ONE_SQL, (qq,)).fetchone()
+    if not row:
+        return None
+    return {
+        'qq': row[0],
+        'reason': row[1],
+        'operator_id': row[2],
+        'created_at': row[3],
+        'expires_at': row[4]
+    }
@@ -0,0 +1,50 @@
+import sqlite3
+import threading
+import os
+from .migrations import run_migrations
+
+DB_PATH = os.path.join(os.path.dirname(__file__), "data", "group_record.db")
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = False
+
+def _connect() -> sqlite3.Connection:
+    """创建新连接并设置连接级 PRAGMA"""
+    conn = sqlite3.connect(
+        DB_PATH,
+        timeout=30,
+        check_same_thread=False,
+        cached_statements=256  # 持久连接上复用预编译语句
+    )
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA busy_timeout=30000")
+    return conn
+
+def init_db() -> None:
+    """初始化数据库并执行未应用的迁移，进程内只执行一次"""
+    global _initialized
+    if _initialized:
+        return
+    with _init_lock:
+        if _initialized:
+            return
+        os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+        conn = _connect()
+        try:
+            # WAL 模式写入数据库文件后持久生效，读写互不阻塞
+            conn.execute("PRAGMA journal_mode=WAL")
+            run_migrations(conn)
+        finally:
+            conn.close()
+        _initialized = True
+
+def get_connection() -> sqlite3.Connection:
+    """获取当前线程的持久连接"""
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        init_db()
+        conn = _connect()
+        _local.conn = conn
+    return conn
@@ -1,73 +1,254 @@
-import sqlite3
-from datetime import datetime
-from typing import List
-import os
-from functools import wraps
-
-DB_PATH = os.path.join(os.path.dirname(__file__), "data", "group_record.db")
-
-def ensure_db_initialized(func):
-    """确保数据库已初始化的装饰器"""
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        # Check if table exists first
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='group_records'")
-        if not cursor.fetchone():
-            cursor.execute('''
-            CREATE TABLE group_records (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                qq INTEGER NOT NULL,
-                group_id INTEGER NOT NULL,
-                join_time TIMESTAMP NOT NULL
-            )
-            ''')
-            # Create an index for faster queries
-            cursor.execute("CREATE INDEX idx_qq_group ON group_records(qq, group_id)")
-        conn.commit()
-        conn.close()
-        return func(*args, **kwargs)
-    return wrapper
-
-@ensure_db_initialized
+import atexit
+import queue
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple, Union
+from extensions import logger
+from .database import get_connection
+
+INSERT_RECORD_SQL = "INSERT OR REPLACE INTO group_records (qq, group_id, join_time) VALUES (?, ?, ?)"
+COUNT_RECORDS_SQL = "SELECT COUNT(*), MIN(join_time) FROM group_records WHERE qq = ? AND join_time >= ?"
+DELETE_RECORDS_SQL = "DELETE FROM group_records WHERE qq = ?"
+WARM_CACHE_SQL = (
+    "SELECT qq, COUNT(*), MIN(join_time) FROM group_records WHERE join_time >= ? "
+    "GROUP BY qq ORDER BY MAX(join_time) DESC LIMIT ?"
+)
+ARCHIVE_RECORDS_SQL = '''
+INSERT INTO group_records_archive (qq, join_count, first_join, last_join)
+SELECT qq, COUNT(*), MIN(join_time), MAX(join_time) FROM group_records
+WHERE join_time < ? GROUP BY qq
+ON CONFLICT(qq) DO UPDATE SET
+    join_count = join_count + excluded.join_count,
+    first_join = MIN(first_join, excluded.first_join),
+    last_join = MAX(last_join, excluded.last_join)
+'''
+DELETE_EXPIRED_SQL = "DELETE FROM group_records WHERE join_time < ?"
+
+# 加群次数缓存上限，超出后淘汰最久未访问的用户
+JOIN_COUNT_CACHE_SIZE = 10000
+
+# 批量写入: 每个事务最多写入的记录数，以及攒批的最长等待时间(秒)
+WRITE_BATCH_SIZE = 200
+WRITE_BATCH_WAIT = 0.2
+# 写入失败的批次重新入队，每条记录最多尝试 WRITE_MAX_ATTEMPTS 次，两次尝试之间等待 WRITE_RETRY_DELAY 秒
+WRITE_MAX_ATTEMPTS = 3
+WRITE_RETRY_DELAY = 1.0
+
+# 只统计最近 N 天内的加群记录，None 表示统计全部历史
+_retention_days: Optional[int] = None
+
+# 加群次数缓存: qq -> (窗口内加群次数, 窗口内最早的加群时间)，包含尚未落库的记录
+# 最早的加群时间滑出窗口后缓存条目失效
+_join_counts: "OrderedDict[int, Tuple[int, Optional[str]]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+# 已入队但尚未提交的记录数: qq -> 条数
+_pending_counts: Dict[int, int] = defaultdict(int)
+# 每次清空用户记录时递增，入队时记下当时的值，写入时跳过清空前入队的记录
+_clear_epochs: Dict[int, int] = defaultdict(int)
+# 队列元素: (qq, group_id, join_time, 入队时的清空代数, 已尝试次数)
+_write_queue: "queue.Queue" = queue.Queue()
+_writer_thread = None
+_writer_lock = threading.Lock()
+_compaction_thread = None
+
+def _to_text(join_time: Union[datetime, str]) -> str:
+    """统一时间格式，保证按字符串比较与按时间比较一致"""
+    if isinstance(join_time, datetime):
+        return join_time.isoformat(sep=' ')
+    return join_time
+
+def _cutoff() -> str:
+    """计数窗口起点，未设置保留期时返回最小值"""
+    if not _retention_days:
+        return ''
+    return _to_text(datetime.now() - timedelta(days=_retention_days))
+
+def configure_retention(days: Optional[int]) -> None:
+    """设置加群记录保留天数，0 或 None 表示不过期"""
+    global _retention_days
+    _retention_days = days or None
+    with _cache_lock:
+        _join_counts.clear()
+
+def _cache_put(qq: int, count: int, oldest: Optional[str]) -> None:
+    _join_counts[qq] = (count, oldest)
+    _join_counts.move_to_end(qq)
+    while len(_join_counts) > JOIN_COUNT_CACHE_SIZE:
+        _join_counts.popitem(last=False)
+
+def warm_join_count_cache() -> int:
+    """用最近加群的用户预热缓存，返回预热的用户数"""
+    rows = get_connection().execute(WARM_CACHE_SQL, (_cutoff(), JOIN_COUNT_CACHE_SIZE)).fetchall()
+    with _cache_lock:
+        # 按最近加群时间倒序查询，逆序写入使最近的用户最晚被淘汰
+        for qq, count, oldest in reversed(rows):
+            _cache_put(qq, count, oldest)
+    return len(rows)
+
+def _is_live(item: tuple) -> bool:
+    # 调用方已持有 _cache_lock
+    return item[3] == _clear_epochs.get(item[0], 0)
+
+def _release_pending(qq: int) -> None:
+    # 调用方已持有 _cache_lock
+    _pending_counts[qq] -= 1
+    if _pending_counts[qq] <= 0:
+        del _pending_counts[qq]
+
+def _write_batch(batch: list) -> None:
+    conn = get_connection()
+    # 提交与待写计数更新在同一把锁内完成，读者不会重复计算
+    with _cache_lock:
+        live = [item for item in batch if _is_live(item)]
+        with conn:
+            conn.executemany(INSERT_RECORD_SQL, [item[:3] for item in live])
+        for item in live:
+            _release_pending(item[0])
+
+def _handle_failed_batch(batch: list) -> None:
+    """未用完尝试次数的记录重新入队，其余记录丢弃并只撤销它们自身的计数"""
+    retry = [item[:4] + (item[4] + 1,) for item in batch if item[4] + 1 < WRITE_MAX_ATTEMPTS]
+    dropped = [item for item in batch if item[4] + 1 >= WRITE_MAX_ATTEMPTS]
+    if retry:
+        time.sleep(WRITE_RETRY_DELAY)
+        for item in retry:
+            _write_queue.put(item)
+    if dropped:
+        with _cache_lock:
+            for item in dropped:
+                if not _is_live(item):
+                    continue
+                qq = item[0]
+                _release_pending(qq)
+                entry = _join_counts.get(qq)
+                if entry is not None:
+                    _join_counts[qq] = (max(entry[0] - 1, 0), entry[1])
+        logger.error(f"{len(dropped)} 条加群记录多次写入失败，已丢弃")
+
+def _writer_loop() -> None:
+    while True:
+        batch = [_write_queue.get()]
+        try:
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    batch.append(_write_queue.get(timeout=WRITE_BATCH_WAIT))
+                except queue.Empty:
+                    break
+            _write_batch(batch)
+        except Exception as e:
+            logger.error(f"批量写入 {len(batch)} 条加群记录失败: {str(e)}", exc_info=True)
+            # 重新入队发生在 task_done 之前，flush() 会一直等到这些记录最终写入或被丢弃
+            _handle_failed_batch(batch)
+        finally:
+            for _ in batch:
+                _write_queue.task_done()
+
+def _ensure_writer() -> None:
+    global _writer_thread
+    if _writer_thread is None:
+        with _writer_lock:
+            if _writer_thread is None:
+                _writer_thread = threading.Thread(
+                    target=_writer_loop,
+                    name='group-record-writer',
+                    daemon=True
+                )
+                _writer_thread.start()
+
+def flush() -> None:
+    """等待所有已入队的记录写入数据库"""
+    if _writer_thread is not None:
+        _write_queue.join()
+
+atexit.register(flush)
+
 def add_record(qq: int, group_id: int, join_time: datetime = None):
-    """添加一条加群记录"""
+    """添加一条加群记录，由后台线程批量写入数据库，计数立即生效"""
     if join_time is None:
         join_time = datetime.now()
-        
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "INSERT OR REPLACE INTO group_records (qq, group_id, join_time) VALUES (?, ?, ?)",
-            (qq, group_id, join_time)
-        )
-        conn.commit()
-    finally:
-        conn.close()
-
-@ensure_db_initialized
+    join_time = _to_text(join_time)
+
+    _ensure_writer()
+    with _cache_lock:
+        _pending_counts[qq] += 1
+        if qq in _join_counts:
+            count, oldest = _join_counts[qq]
+            _cache_put(qq, count + 1, min(oldest, join_time) if oldest else join_time)
+        _write_queue.put((qq, group_id, join_time, _clear_epochs.get(qq, 0), 0))
+
 def get_user_join_count(qq: int) -> int:
-    """获取用户加群次数"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    try:
-        cursor.execute("SELECT COUNT(*) FROM group_records WHERE qq = ?", (qq,))
-        return cursor.fetchone()[0]
-    finally:
-        conn.close()
-
-@ensure_db_initialized
+    """获取用户在保留期内的加群次数"""
+    cutoff = _cutoff()
+    with _cache_lock:
+        entry = _join_counts.get(qq)
+        if entry is not None and (entry[1] is None or entry[1] >= cutoff):
+            _join_counts.move_to_end(qq)
+            return entry[0]
+
+        count, oldest = get_connection().execute(COUNT_RECORDS_SQL, (qq, cutoff)).fetchone()
+        pending = _pending_counts.get(qq, 0)
+        if pending and oldest is None:
+            # 只有未落库的记录，均为刚刚写入
+            oldest = _to_text(datetime.now())
+        count += pending
+        _cache_put(qq, count, oldest)
+        return count
+
 def clear_user_records(qq: int) -> int:
-    """清空用户的所有加群记录，返回被删除的记录数"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    try:
-        cursor.execute("DELETE FROM group_records WHERE qq = ?", (qq,))
-        deleted_count = cursor.rowcount
-        conn.commit()
-        return deleted_count
-    finally:
-        conn.close()
\ No newline at end of file
+    """清空用户的所有加群记录，返回被删除的记录数(包含尚未落库的记录)"""
+    conn = get_connection()
+    # 整个清空过程持有 _cache_lock: 递增清空代数后，此前入队(包括写入线程已取出但尚未提交)的记录都不会再落库，
+    # 而写入线程提交时同样需要这把锁，因此不会出现删除之后又写入旧记录的情况
+    with _cache_lock:
+        _clear_epochs[qq] += 1
+        pending = _pending_counts.pop(qq, 0)
+        with conn:
+            deleted_count = conn.execute(DELETE_RECORDS_SQL, (qq,)).rowcount
+        _cache_put(qq, 0, None)
+        return deleted_count + pending
+
+def compact_records() -> int:
+    """
+    归档并删除保留期之外的加群记录，然后更新统计信息并回收空间
+
+    Returns:
+        int: 被归档删除的记录数
+    """
+    flush()
+    conn = get_connection()
+    deleted = 0
+    if _retention_days:
+        cutoff = _cutoff()
+        with conn:
+            conn.execute(ARCHIVE_RECORDS_SQL, (cutoff,))
+            deleted = conn.execute(DELETE_EXPIRED_SQL, (cutoff,)).rowcount
+
+    conn.execute("ANALYZE")
+    if deleted:
+        conn.execute("VACUUM")
+    return deleted
+
+def _compaction_loop(interval: float) -> None:
+    while True:
+        time.sleep(interval)
+        try:
+            deleted = compact_records()
+            logger.info(f"加群记录压缩完成，归档 {deleted} 条过期记录")
+        except Exception as e:
+            logger.error(f"加群记录压缩失败: {str(e)}", exc_info=True)
+
+def start_compaction(interval: float = 24 * 3600) -> None:
+    """启动后台定期压缩线程"""
+    global _compaction_thread
+    if _compaction_thread is not None:
+        return
+    _compaction_thread = threading.Thread(
+        target=_compaction_loop,
+        args=(interval,),
+        name='group-record-compaction',
+        daemon=True
+    )
+    _compaction_thread.start()
@@ -0,0 +1,122 @@
+import sqlite3
+from typing import Callable, List, Tuple
+
+def _v1_create_group_records(conn: sqlite3.Connection) -> None:
+    """加群记录表（兼容已存在的旧数据库）"""
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS group_records (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        qq INTEGER NOT NULL,
+        group_id INTEGER NOT NULL,
+        join_time TIMESTAMP NOT NULL
+    )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_qq_group ON group_records(qq, group_id)")
+
+def _v2_index_qq(conn: sqlite3.Connection) -> None:
+    """COUNT(*) WHERE qq = ? 专用的单列索引"""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_qq ON group_records(qq)")
+
+def _v3_create_blacklist(conn: sqlite3.Connection) -> None:
+    """永久拉黑名单，时间字段为 Unix 时间戳，expires_at 为空表示永不过期"""
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS blacklist (
+        qq INTEGER PRIMARY KEY,
+        reason TEXT NOT NULL DEFAULT '',
+        operator_id INTEGER,
+        created_at INTEGER NOT NULL,
+        expires_at INTEGER
+    )
+    ''')
+
+def _v4_retention(conn: sqlite3.Connection) -> None:
+    """按时间窗口计数所需的索引，以及过期记录的汇总归档表"""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_qq_join_time ON group_records(qq, join_time)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_join_time ON group_records(join_time)")
+    # (qq, join_time) 已覆盖按 qq 的查询
+    conn.execute("DROP INDEX IF EXISTS idx_qq")
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS group_records_archive (
+        qq INTEGER PRIMARY KEY,
+        join_count INTEGER NOT NULL,
+        first_join TIMESTAMP NOT NULL,
+        last_join TIMESTAMP NOT NULL
+    )
+    ''')
+
+def _v5_create_audit_cache(conn: sqlite3.Connection) -> None:
+    """加群审核结果缓存，verdict 为 JSON 文本，时间字段为 Unix 时间戳"""
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS audit_cache (
+        cache_key TEXT PRIMARY KEY,
+        verdict TEXT NOT NULL,
+        created_at INTEGER NOT NULL,
+        expires_at INTEGER NOT NULL
+    )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_audit_cache_expires ON audit_cache(expires_at)")
+
+def _v6_migrate_legacy_bans(conn: sqlite3.Connection) -> None:
+    """
+    旧版永久踢出通过写入 max_joins 条伪造的加群记录实现拉黑，这些记录会被保留期和归档清理掉，
+    导致永久拉黑失效。将其转为 blacklist 中的永久条目并删除伪造记录
+
+    伪造记录的时间由 strftime("%Y-%m-%d %H:%M:%S") 生成，长度为 19；
+    正常加群记录的时间带微秒，可据此区分
+    """
+    conn.execute('''
+    INSERT OR IGNORE INTO blacklist (qq, reason, operator_id, created_at, expires_at)
+    SELECT qq, '历史永久踢出记录', NULL, CAST(strftime('%s', MIN(join_time), 'utc') AS INTEGER), NULL
+    FROM group_records
+    WHERE length(join_time) = 19
+    GROUP BY qq
+    ''')
+    conn.execute("DELETE FROM group_records WHERE length(join_time) = 19")
+
+# 按版本号顺序排列，新迁移只能追加到末尾
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "create group_records", _v1_create_group_records),
+    (2, "index group_records.qq", _v2_index_qq),
+    (3, "create blacklist", _v3_create_blacklist),
+    (4, "join record retention", _v4_retention),
+    (5, "create audit_cache", _v5_create_audit_cache),
+    (6, "migrate legacy bans to blacklist", _v6_migrate_legacy_bans),
+]
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+def run_migrations(conn: sqlite3.Connection) -> List[int]:
+    """
+    执行所有未应用的迁移，每个迁移在独立事务中完成
+
+    Returns:
+        List[int]: 本次应用的迁移版本号
+    """
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        description TEXT NOT NULL,
+        applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+    applied = []
+    current = get_schema_version(conn)
+    for version, description, migrate in MIGRATIONS:
+        if version <= current:
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            migrate(conn)
+            conn.execute(
+                "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                (version, description)
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(version)
+    return applied
@@ -0,0 +1,38 @@
+import asyncio
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Coroutine, Optional
+
+class BackgroundLoop:
+    """
+    在独立线程中常驻运行的事件循环
+
+    供 Flask 处理线程等同步代码安全地提交协程并等待结果
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro: Coroutine) -> Future:
+        """提交协程，立即返回 Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run_sync(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """提交协程并阻塞等待结果，超时后取消协程并抛出 TimeoutError"""
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError(f'不能在事件循环线程 {self.name} 内同步等待协程')
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            # 不取消的话协程会继续占用事件循环、限流令牌和连接
+            future.cancel()
+            raise TimeoutError(f'事件循环 {self.name} 中的协程执行超过 {timeout} 秒，已取消')
@@ -0,0 +1,131 @@
+import heapq
+import threading
+import time
+from array import array
+from typing import Any, Callable, Dict, List, Optional
+from extensions import logger, config
+from utils.member_store import MemberTable
+
+SECONDS_PER_DAY = 24 * 3600
+
+# 打分因子: (成员表, 当前时间) -> 每行一个数值
+FACTORS: Dict[str, Callable[[MemberTable, float], array]] = {
+    'inactive_days': lambda table, now: array('d', [(now - t) / SECONDS_PER_DAY for t in table.last_sent_time]),
+    'join_days': lambda table, now: array('d', [(now - t) / SECONDS_PER_DAY for t in table.join_time]),
+    'level': lambda table, now: table.level,
+}
+
+# 内置策略，可在 config['cleanup_policies'] 中覆盖或新增
+BUILTIN_POLICIES: Dict[str, Dict[str, Any]] = {
+    # 未发言天数 / (等级 + 1)，与原有清理规则一致
+    'recency': {'weights': {'inactive_days': 1}, 'level_divisor': True},
+    # 只看未发言天数
+    'inactive': {'weights': {'inactive_days': 1}},
+    # 入群时间越久且越不活跃越优先
+    'join_age': {'weights': {'inactive_days': 1, 'join_days': 0.5}, 'level_divisor': True},
+    # 等级越低越优先
+    'low_level': {'weights': {'level': -1}},
+}
+
+DEFAULT_POLICY = 'recency'
+
+class CleanupPolicy:
+    """
+    编译后的清理打分策略
+
+    策略定义:
+        weights: 因子名 -> 权重，分数为各因子的线性组合
+        level_divisor: 是否再除以 (等级 + 1)
+        min_inactive_days: 未发言天数低于该值的成员不参与清理
+        exempt: 豁免的QQ号列表
+        exempt_roles: 豁免的角色，默认群主和管理员
+        exempt_robots: 是否豁免 is_robot 为真的成员，默认是
+    """
+
+    def __init__(self, name: str, spec: Dict[str, Any]):
+        weights = spec.get('weights') or {'inactive_days': 1}
+        unknown = set(weights) - set(FACTORS)
+        if unknown:
+            raise ValueError(f"清理策略 {name} 包含未知因子: {', '.join(sorted(unknown))}")
+
+        self.name = name
+        self.spec = spec
+        self._terms = [(FACTORS[factor], float(weight)) for factor, weight in weights.items() if weight]
+        self._level_divisor = bool(spec.get('level_divisor', False))
+        self._min_inactive = float(spec.get('min_inactive_days', 0)) * SECONDS_PER_DAY
+        self._exempt_ids = {int(qq) for qq in spec.get('exempt', [])}
+        self._exempt_roles = set(spec.get('exempt_roles', ('owner', 'admin')))
+        self._exempt_robots = bool(spec.get('exempt_robots', True))
+
+    def score(self, table: MemberTable, now: Optional[float] = None) -> array:
+        """计算整个群每个成员的分数，分数越高越优先清理"""
+        now = now or time.time()
+        columns = [(factor(table, now), weight) for factor, weight in self._terms]
+        if len(columns) == 1:
+            column, weight = columns[0]
+            scores = array('d', [value * weight for value in column])
+        else:
+            scores = array('d', bytes(8 * len(table)))
+            for column, weight in columns:
+                for row, value in enumerate(column):
+                    scores[row] += value * weight
+        if self._level_divisor:
+            for row, level in enumerate(table.level):
+                scores[row] /= level + 1
+        return scores
+
+    def eligible_rows(self, table: MemberTable, now: Optional[float] = None):
+        """参与清理的行号"""
+        now = now or time.time()
+        latest = now - self._min_inactive
+        for row, user_id in enumerate(table.user_ids):
+            if (table.roles[row] in self._exempt_roles
+                    or user_id in self._exempt_ids
+                    or (self._exempt_robots and table.is_robot[row])
+                    or (self._min_inactive and table.last_sent_time[row] > latest)):
+                continue
+            yield row
+
+    def select(self, table: MemberTable, count: int, now: Optional[float] = None) -> List[dict]:
+        """选出分数最高的 count 名成员"""
+        now = now or time.time()
+        scores = self.score(table, now)
+        top = heapq.nlargest(count, self.eligible_rows(table, now), key=scores.__getitem__)
+        return [table.members[row] for row in top]
+
+class PolicyRegistry:
+    """清理策略注册表，策略只在注册时编译一次"""
+
+    def __init__(self):
+        self._policies: Dict[str, CleanupPolicy] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, spec: Dict[str, Any]) -> CleanupPolicy:
+        policy = CleanupPolicy(name, spec)
+        with self._lock:
+            self._policies[name] = policy
+        return policy
+
+    def load(self, specs: Dict[str, Dict[str, Any]]) -> None:
+        for name, spec in specs.items():
+            try:
+                self.register(name, spec)
+            except ValueError as e:
+                logger.error(str(e))
+
+    def get(self, name: str) -> Optional[CleanupPolicy]:
+        with self._lock:
+            return self._policies.get(name)
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return list(self._policies)
+
+    def for_group(self, group_id: int) -> CleanupPolicy:
+        """群配置的策略，未配置或不存在时使用默认策略"""
+        name = config.get('cleanup_group_policies', {}).get(str(group_id), DEFAULT_POLICY)
+        return self.get(name) or self.get(DEFAULT_POLICY)
+
+policy_registry = PolicyRegistry()
+policy_registry.load(BUILTIN_POLICIES)
+policy_registry.load(config.get('cleanup_policies', {}))
@@ -0,0 +1,153 @@
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, Dict, Any, List
+from extensions import logger
+
+class EventPriority(Enum):
+    HIGH = "high"  # 通知、请求事件
+    LOW = "low"    # 普通消息事件，队列饱和时优先丢弃
+
+def get_event_priority(data: Dict[str, Any]) -> EventPriority:
+    """根据事件类型判断优先级"""
+    if data.get('post_type') == 'message':
+        return EventPriority.LOW
+    return EventPriority.HIGH
+
+class _Lane:
+    """单个顺序执行通道，同一群的事件总是落在同一通道上"""
+
+    def __init__(self, index: int, max_size: int):
+        self.index = index
+        self.max_size = max_size
+        self.queue = deque()  # (priority, enqueue_time, data)
+        self.cond = threading.Condition()
+        self.busy = False
+        self.processed = 0
+        self.dropped = 0
+        self.rejected = 0
+        # 等待时间在出队时统计，使用独立的出队计数求平均，不受处理中事件的影响
+        self.waited = 0
+        self.total_wait = 0.0
+
+    def _evict_low(self) -> bool:
+        """移除通道中最早的低优先级事件"""
+        for item in self.queue:
+            if item[0] == EventPriority.LOW:
+                self.queue.remove(item)
+                self.dropped += 1
+                return True
+        return False
+
+    def put(self, priority: EventPriority, data: Dict[str, Any]) -> bool:
+        with self.cond:
+            if len(self.queue) >= self.max_size:
+                if priority == EventPriority.LOW or not self._evict_low():
+                    self.rejected += 1
+                    return False
+                logger.warning(f'事件通道 {self.index} 已满，丢弃一条低优先级消息事件')
+            self.queue.append((priority, time.monotonic(), data))
+            self.cond.notify()
+        return True
+
+    def take(self) -> Dict[str, Any]:
+        with self.cond:
+            while not self.queue:
+                self.cond.wait()
+            _, enqueue_time, data = self.queue.popleft()
+            self.total_wait += time.monotonic() - enqueue_time
+            self.waited += 1
+            self.busy = True
+            return data
+
+    def done(self) -> None:
+        with self.cond:
+            self.busy = False
+            self.processed += 1
+
+class EventDispatcher:
+    """
+    按群分配的有序事件处理通道
+
+    事件根据 group_id 哈希到固定的通道上，每个通道由单个线程顺序处理，
+    保证同一群内的事件按到达顺序执行，不同群之间仍然并行。
+
+    通道满时的溢出策略:
+    1. 新事件为低优先级 -> 直接拒绝
+    2. 新事件为高优先级 -> 丢弃该通道中最早的低优先级事件腾出位置，没有可丢弃的则拒绝
+    """
+
+    def __init__(self, handler: Callable[[Dict[str, Any]], None],
+                 max_workers: int = 8, max_queue_size: int = 256):
+        self.handler = handler
+        self.max_workers = max(1, max_workers)
+        self.max_queue_size = max(self.max_workers, max_queue_size)
+
+        lane_size = self.max_queue_size // self.max_workers
+        self._lanes: List[_Lane] = [_Lane(i, lane_size) for i in range(self.max_workers)]
+        for lane in self._lanes:
+            threading.Thread(
+                target=self._worker_loop,
+                args=(lane,),
+                name=f'event-lane-{lane.index}',
+                daemon=True
+            ).start()
+
+    def _lane_for(self, data: Dict[str, Any]) -> _Lane:
+        try:
+            key = int(data.get('group_id') or 0)
+        except (TypeError, ValueError):
+            key = 0
+        return self._lanes[key % self.max_workers]
+
+    def submit(self, data: Dict[str, Any]) -> bool:
+        """
+        提交事件
+
+        Returns:
+            bool: 是否成功入队，False 表示对应通道已饱和
+        """
+        return self._lane_for(data).put(get_event_priority(data), data)
+
+    def _worker_loop(self, lane: _Lane) -> None:
+        while True:
+            data = lane.take()
+            try:
+                self.handler(data)
+            except Exception as e:
+                logger.error(f'事件通道 {lane.index} 处理时发生错误: {str(e)}', exc_info=True)
+            finally:
+                lane.done()
+
+    def stats(self) -> Dict[str, Any]:
+        """获取队列深度和线程利用率"""
+        lanes = []
+        for lane in self._lanes:
+            with lane.cond:
+                lanes.append({
+                    'depth': len(lane.queue),
+                    'busy': lane.busy,
+                    'processed': lane.processed,
+                    'dropped': lane.dropped,
+                    'rejected': lane.rejected,
+                    'waited': lane.waited,
+                    'total_wait': lane.total_wait
+                })
+
+        busy = sum(1 for lane in lanes if lane['busy'])
+        processed = sum(lane['processed'] for lane in lanes)
+        waited = sum(lane.pop('waited') for lane in lanes)
+        total_wait = sum(lane.pop('total_wait') for lane in lanes)
+        return {
+            'queue_depth': sum(lane['depth'] for lane in lanes),
+            'max_queue_size': self.max_queue_size,
+            'workers': self.max_workers,
+            'busy_workers': busy,
+            'utilization': round(busy / self.max_workers, 3),
+            'processed': processed,
+            'dropped': sum(lane['dropped'] for lane in lanes),
+            'rejected': sum(lane['rejected'] for lane in lanes),
+            'avg_wait_ms': round(total_wait / waited * 1000, 2) if waited else 0.0,
+            'lanes': lanes
+        }
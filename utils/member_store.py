@@ -0,0 +1,271 @@
+import threading
+import time
+from array import array
+from typing import Callable, Dict, List, Optional, Iterable, Set, Tuple
+from extensions import logger, config
+from http_requests.async_onebot_action import fan_out, async_get_group_member_list
+
+def _to_number(value) -> float:
+    try:
+        return float(value or 0)
+    except (ValueError, TypeError):
+        return 0.0
+
+class MemberTable:
+    """
+    单个群成员快照的列式视图
+
+    数值列使用 array('d') 连续存储，批量打分时只需一次顺序遍历；
+    members 与各列按行号一一对应
+    """
+
+    def __init__(self, members: List[dict]):
+        self.members = members
+        self.user_ids = array('q', (int(m['user_id']) for m in members))
+        self.last_sent_time = array('d', (_to_number(m.get('last_sent_time')) for m in members))
+        self.join_time = array('d', (_to_number(m.get('join_time')) for m in members))
+        self.level = array('d', (_to_number(m.get('level')) for m in members))
+        self.roles = [m.get('role') or 'member' for m in members]
+        self.is_robot = [bool(m.get('is_robot')) for m in members]
+        self.row_of = {user_id: row for row, user_id in enumerate(self.user_ids)}
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+class GroupMemberStore:
+    """
+    本地群成员缓存
+
+    每个群的成员列表只在首次使用时完整下载一次，之后由后台线程定期刷新，
+    并根据 group_increase / group_decrease / group_card / group_admin 通知事件增量更新；
+    下载期间收到的通知会记录下来，在新快照替换旧快照后重放，避免快照覆盖更新的变动
+
+    同时维护 user_id -> 群号集合 的倒排索引，用于 O(1) 判断用户所在的群
+    """
+
+    def __init__(self, refresh_interval: float = 3600, max_age: Optional[float] = None):
+        self.refresh_interval = refresh_interval
+        # 超过该时长未完整刷新的群视为过期，倒排索引不再可信
+        self.max_age = max_age or refresh_interval * 2
+        self._members: Dict[int, Dict[int, dict]] = {}
+        self._user_groups: Dict[int, Set[int]] = {}
+        self._loaded_at: Dict[int, float] = {}
+        # 列式视图按需构建，成员增减或角色变化时失效
+        self._tables: Dict[int, MemberTable] = {}
+        # 群号 -> 正在进行的下载各自的通知记录，每条记录为 (变更函数, 参数)
+        self._journals: Dict[int, List[List[Tuple[Callable, tuple]]]] = {}
+        self._lock = threading.RLock()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    def _replace_group(self, group_id: int, members: List[dict],
+                       journal: Iterable[Tuple[Callable, tuple]] = ()) -> None:
+        snapshot = {}
+        for member in members:
+            if isinstance(member, dict) and member.get('user_id'):
+                snapshot[int(member['user_id'])] = member
+        with self._lock:
+            for user_id in self._members.get(group_id, {}).keys() - snapshot.keys():
+                self._unindex(group_id, user_id)
+            for user_id in snapshot:
+                self._user_groups.setdefault(user_id, set()).add(group_id)
+            self._members[group_id] = snapshot
+            self._loaded_at[group_id] = time.time()
+            self._tables.pop(group_id, None)
+            # 快照是在这些通知之前下载的，重放后才是最新状态
+            for change, args in journal:
+                change(*args)
+
+    def _unindex(self, group_id: int, user_id: int) -> None:
+        groups = self._user_groups.get(user_id)
+        if groups is not None:
+            groups.discard(group_id)
+            if not groups:
+                del self._user_groups[user_id]
+
+    def load(self, group_ids: Iterable[int]) -> Dict[int, bool]:
+        """
+        并发下载多个群的完整成员列表
+
+        Returns:
+            Dict[int, bool]: 群号 -> 是否加载成功
+        """
+        group_ids = [int(gid) for gid in group_ids]
+        journals = {}
+        with self._lock:
+            for group_id in set(group_ids):
+                journals[group_id] = []
+                self._journals.setdefault(group_id, []).append(journals[group_id])
+
+        results = {}
+        try:
+            responses = fan_out(async_get_group_member_list, group_ids)
+            for group_id, response in responses.items():
+                if response.get('status') != 'ok' or not isinstance(response.get('data'), list):
+                    logger.error(f'加载群 {group_id} 成员列表失败: {response.get("message")}')
+                    results[group_id] = False
+                    continue
+                self._replace_group(group_id, response['data'], journals[group_id])
+                results[group_id] = True
+        finally:
+            with self._lock:
+                for group_id, journal in journals.items():
+                    active = self._journals.get(group_id, [])
+                    active[:] = [j for j in active if j is not journal]
+                    if not active:
+                        self._journals.pop(group_id, None)
+        return results
+
+    def _record(self, group_id: int, change: Callable, *args) -> None:
+        """应用通知变更，并记录到该群正在进行的下载中，调用方已持有 self._lock"""
+        for journal in self._journals.get(group_id, ()):
+            journal.append((change, args))
+        change(*args)
+
+    def is_loaded(self, group_id: int) -> bool:
+        with self._lock:
+            return int(group_id) in self._members
+
+    def get_members(self, group_id: int) -> Optional[List[dict]]:
+        """获取群成员列表，尚未加载时先下载，下载失败返回 None"""
+        group_id = int(group_id)
+        if not self.is_loaded(group_id) and not self.load([group_id])[group_id]:
+            return None
+        with self._lock:
+            return list(self._members[group_id].values())
+
+    def get_members_by_group(self, group_ids: Iterable[int]) -> Dict[int, List[dict]]:
+        """获取多个群的成员列表，未加载的群并发下载，下载失败的群返回空列表"""
+        group_ids = [int(gid) for gid in group_ids]
+        missing = [gid for gid in group_ids if not self.is_loaded(gid)]
+        if missing:
+            self.load(missing)
+        with self._lock:
+            return {gid: list(self._members.get(gid, {}).values()) for gid in group_ids}
+
+    def get_table(self, group_id: int) -> Optional[MemberTable]:
+        """获取群成员的列式视图，尚未加载时先下载，下载失败返回 None"""
+        group_id = int(group_id)
+        if not self.is_loaded(group_id) and not self.load([group_id])[group_id]:
+            return None
+        with self._lock:
+            table = self._tables.get(group_id)
+            if table is None:
+                table = MemberTable(list(self._members[group_id].values()))
+                self._tables[group_id] = table
+            return table
+
+    def has_member(self, group_id: int, user_id: int) -> bool:
+        with self._lock:
+            return int(user_id) in self._members.get(int(group_id), {})
+
+    def is_fresh(self, group_id: int) -> bool:
+        """群成员快照是否已加载且未过期"""
+        with self._lock:
+            loaded_at = self._loaded_at.get(int(group_id))
+        return loaded_at is not None and time.time() - loaded_at <= self.max_age
+
+    def groups_of(self, user_id: int, group_ids: Iterable[int]) -> Optional[Set[int]]:
+        """
+        通过倒排索引查询用户在 group_ids 中的哪些群
+
+        Returns:
+            Optional[Set[int]]: 用户所在的群号集合，任一群的快照缺失或过期时返回 None
+        """
+        group_ids = {int(gid) for gid in group_ids}
+        if not all(self.is_fresh(gid) for gid in group_ids):
+            return None
+        with self._lock:
+            return self._user_groups.get(int(user_id), set()) & group_ids
+
+    def apply_increase(self, group_id: int, user_id: int, timestamp: Optional[int] = None) -> None:
+        """新成员入群，只使用通知中的字段，等级等详细信息在下次刷新时补全"""
+        group_id, user_id = int(group_id), int(user_id)
+        now = int(timestamp or time.time())
+        member = {
+            'group_id': group_id,
+            'user_id': user_id,
+            'role': 'member',
+            'level': '0',
+            'join_time': now,
+            'last_sent_time': now
+        }
+        with self._lock:
+            self._record(group_id, self._increase, group_id, user_id, member)
+
+    def _increase(self, group_id: int, user_id: int, member: dict) -> None:
+        members = self._members.get(group_id)
+        # 群未加载时首次下载会包含该成员；快照中已有该成员时保留快照中更完整的信息
+        if members is None or user_id in members:
+            return
+        members[user_id] = dict(member)
+        self._user_groups.setdefault(user_id, set()).add(group_id)
+        self._tables.pop(group_id, None)
+
+    def apply_decrease(self, group_id: int, user_id: int) -> None:
+        """成员退群或被踢出"""
+        group_id, user_id = int(group_id), int(user_id)
+        with self._lock:
+            self._record(group_id, self._decrease, group_id, user_id)
+
+    def _decrease(self, group_id: int, user_id: int) -> None:
+        if self._members.get(group_id, {}).pop(user_id, None) is not None:
+            self._unindex(group_id, user_id)
+            self._tables.pop(group_id, None)
+
+    def apply_card(self, group_id: int, user_id: int, card: str) -> None:
+        """成员群名片变更"""
+        with self._lock:
+            self._record(int(group_id), self._card, int(group_id), int(user_id), card)
+
+    def _card(self, group_id: int, user_id: int, card: str) -> None:
+        member = self._members.get(group_id, {}).get(user_id)
+        if member is not None:
+            member['card'] = card
+
+    def apply_admin(self, group_id: int, user_id: int, is_admin: bool) -> None:
+        """管理员设置或取消"""
+        with self._lock:
+            self._record(int(group_id), self._admin, int(group_id), int(user_id), is_admin)
+
+    def _admin(self, group_id: int, user_id: int, is_admin: bool) -> None:
+        member = self._members.get(group_id, {}).get(user_id)
+        if member is not None and member.get('role') != 'owner':
+            member['role'] = 'admin' if is_admin else 'member'
+            self._tables.pop(group_id, None)
+
+    def touch(self, group_id: int, user_id: int, timestamp: Optional[int] = None) -> None:
+        """成员发言时更新最后发言时间"""
+        with self._lock:
+            member = self._members.get(int(group_id), {}).get(int(user_id))
+            if member is not None:
+                member['last_sent_time'] = int(timestamp or time.time())
+                # 发言很频繁，直接更新列式视图而不是使其失效
+                table = self._tables.get(int(group_id))
+                row = table.row_of.get(int(user_id)) if table is not None else None
+                if row is not None:
+                    table.last_sent_time[row] = member['last_sent_time']
+
+    def _refresh_loop(self) -> None:
+        while True:
+            try:
+                self.load(config.get('group_ids', []))
+                logger.info('群成员缓存已刷新')
+            except Exception as e:
+                logger.error(f'刷新群成员缓存失败: {str(e)}', exc_info=True)
+            time.sleep(self.refresh_interval)
+
+    def start_refresh(self) -> None:
+        """启动后台定期刷新线程"""
+        if self._refresh_thread is not None:
+            return
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop,
+            name='member-store-refresh',
+            daemon=True
+        )
+        self._refresh_thread.start()
+
+member_store = GroupMemberStore(
+    refresh_interval=config.get('member_refresh_interval', 3600),
+    max_age=config.get('member_index_max_age')
+)
@@ -0,0 +1,118 @@
+import json
+import threading
+import uuid
+from typing import Dict, Any, Optional
+from extensions import logger, config
+
+class ActionNotSentError(ConnectionError):
+    """动作帧没有发出，OneBot 一定没有执行该动作，可以安全地改用其他通道重发"""
+
+def is_read_only_action(action: str) -> bool:
+    """只读动作重复执行没有副作用，超时后可以改用其他通道重试"""
+    return action.startswith(('get_', 'can_'))
+
+class OneBotConnection:
+    """
+    单个机器人的反向 WebSocket 连接
+
+    动作调用通过 echo 字段与响应匹配
+    """
+
+    def __init__(self, self_id: int, ws):
+        self.self_id = self_id
+        self.ws = ws
+        self._send_lock = threading.Lock()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+        self.closed = False
+
+    def call(self, action: str, params: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        发送动作请求并等待响应
+
+        Raises:
+            ActionNotSentError: 连接已关闭或发送失败，动作帧没有发出
+            ConnectionError: 动作帧已发出，但连接在收到响应前关闭
+            TimeoutError: 动作帧已发出，超时未收到响应
+        """
+        if self.closed:
+            raise ActionNotSentError(f'机器人 {self.self_id} 的连接已关闭')
+
+        echo = uuid.uuid4().hex
+        waiter = {'event': threading.Event(), 'response': None}
+        with self._pending_lock:
+            self._pending[echo] = waiter
+
+        try:
+            frame = json.dumps({'action': action, 'params': params, 'echo': echo}, ensure_ascii=False)
+            try:
+                with self._send_lock:
+                    self.ws.send(frame)
+            except Exception as e:
+                raise ActionNotSentError(f'向机器人 {self.self_id} 发送动作 {action} 失败: {str(e)}') from e
+
+            timeout = timeout or config.get('ws_action_timeout', 10)
+            if not waiter['event'].wait(timeout):
+                raise TimeoutError(f'动作 {action} 等待响应超时')
+            if waiter['response'] is None:
+                raise ConnectionError(f'机器人 {self.self_id} 的连接已关闭')
+            return waiter['response']
+        finally:
+            with self._pending_lock:
+                self._pending.pop(echo, None)
+
+    def resolve(self, frame: Dict[str, Any]) -> bool:
+        """将动作响应交给等待中的调用方，返回是否匹配成功"""
+        with self._pending_lock:
+            waiter = self._pending.get(str(frame.get('echo')))
+        if not waiter:
+            return False
+        waiter['response'] = frame
+        waiter['event'].set()
+        return True
+
+    def close(self) -> None:
+        """关闭连接并唤醒所有等待中的调用"""
+        self.closed = True
+        with self._pending_lock:
+            waiters = list(self._pending.values())
+        for waiter in waiters:
+            waiter['event'].set()
+
+class ConnectionRegistry:
+    """按机器人ID管理反向 WebSocket 连接"""
+
+    def __init__(self):
+        self._connections: Dict[int, OneBotConnection] = {}
+        self._lock = threading.Lock()
+
+    def register(self, connection: OneBotConnection) -> None:
+        with self._lock:
+            old = self._connections.get(connection.self_id)
+            self._connections[connection.self_id] = connection
+        if old:
+            old.close()
+        logger.info(f'机器人 {connection.self_id} 已建立 WebSocket 连接')
+
+    def unregister(self, connection: OneBotConnection) -> None:
+        with self._lock:
+            if self._connections.get(connection.self_id) is connection:
+                del self._connections[connection.self_id]
+        connection.close()
+        logger.info(f'机器人 {connection.self_id} 的 WebSocket 连接已断开')
+
+    def get(self, self_id: Optional[int]) -> Optional[OneBotConnection]:
+        """获取指定机器人的可用连接，未指定机器人或该机器人未连接时返回 None"""
+        if self_id is None:
+            return None
+        with self._lock:
+            connection = self._connections.get(int(self_id))
+        if connection and not connection.closed:
+            return connection
+        return None
+
+    def connected_bots(self) -> list:
+        with self._lock:
+            return list(self._connections.keys())
+
+ws_registry = ConnectionRegistry()
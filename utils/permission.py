@@ -0,0 +1,77 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from extensions import logger, config
+from http_requests.get_group_member_info import get_group_member_info
+
+ADMIN_ROLES = ("owner", "admin")
+
+class PermissionService:
+    """
+    群成员角色查询，带进程内 TTL 缓存
+
+    config['admin_ids'] 中的用户直接视为管理员，不发起任何网络请求；
+    缓存条目由群管理员变动、成员增减等通知事件主动失效
+    """
+
+    def __init__(self, ttl: float = 300, max_entries: int = 4096):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[Tuple[int, int], Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_role(self, group_id: int, user_id: int) -> Optional[str]:
+        """获取成员角色(owner/admin/member)，获取失败返回 None"""
+        key = (int(group_id), int(user_id))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry and entry[1] > now:
+                self._cache.move_to_end(key)
+                return entry[0]
+
+        # 未命中多发生在过期或被通知事件失效之后，绕过协议端缓存，避免读到撤销前的旧角色
+        response = get_group_member_info(group_id, user_id, no_cache=True)
+        if response.get("status") != "ok":
+            logger.warning(f"获取成员 {user_id} 在群 {group_id} 的角色失败: {response.get('message')}")
+            return None
+
+        role = response.get("data", {}).get("role") or "member"
+        self.set_role(group_id, user_id, role)
+        return role
+
+    def set_role(self, group_id: int, user_id: int, role: str) -> None:
+        """写入已知的成员角色"""
+        key = (int(group_id), int(user_id))
+        with self._lock:
+            self._cache[key] = (role, time.monotonic() + self.ttl)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def is_admin(self, group_id: int, user_id: int) -> Optional[bool]:
+        """
+        判断用户是否有管理权限
+
+        Returns:
+            Optional[bool]: 是否为管理员，无法获取角色信息时返回 None
+        """
+        if user_id in config.get('admin_ids', []):
+            return True
+
+        role = self.get_role(group_id, user_id)
+        if role is None:
+            return None
+        return role in ADMIN_ROLES
+
+    def invalidate(self, group_id: int, user_id: Optional[int] = None) -> None:
+        """使缓存失效，未指定 user_id 时清除整个群"""
+        with self._lock:
+            if user_id is not None:
+                self._cache.pop((int(group_id), int(user_id)), None)
+                return
+            for key in [key for key in self._cache if key[0] == int(group_id)]:
+                del self._cache[key]
+
+permission_service = PermissionService(ttl=config.get('permission_cache_ttl', 300))
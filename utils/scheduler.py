@@ -0,0 +1,112 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+from extensions import logger, config
+
+class ScheduledJob:
+    """调度器中的一个待执行任务"""
+
+    def __init__(self, run_at: float, func: Callable, args: tuple, kwargs: dict, name: str):
+        self.run_at = run_at
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.name = name
+        self.cancelled = False
+        self.done = False
+
+    def __repr__(self) -> str:
+        return f"<ScheduledJob {self.name} at {self.run_at:.3f}>"
+
+class Scheduler:
+    """
+    基于最小堆的延迟任务调度器
+
+    单个调度线程按到期时间出堆，任务交给线程池执行，事件处理线程无需 sleep 等待；
+    取消只做标记，出堆时跳过。到期时间基于 time.monotonic()，不受系统时间调整影响
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self._heap: List[Tuple[float, int, ScheduledJob]] = []
+        self._counter = itertools.count()
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _ensure_started(self) -> None:
+        # 调用方已持有 self._cond
+        if self._thread is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='scheduler-job')
+            self._thread = threading.Thread(target=self._run, name='scheduler', daemon=True)
+            self._thread.start()
+
+    def schedule_at(self, run_at: float, func: Callable, *args, **kwargs) -> ScheduledJob:
+        """
+        在指定时间执行任务
+
+        Args:
+            run_at: 执行时间(time.monotonic() 时钟)
+            func: 要执行的函数，其余参数原样传入
+
+        Returns:
+            ScheduledJob: 可用于取消的任务句柄
+        """
+        job = ScheduledJob(run_at, func, args, kwargs, getattr(func, '__name__', repr(func)))
+        with self._cond:
+            self._ensure_started()
+            heapq.heappush(self._heap, (run_at, next(self._counter), job))
+            self._pending += 1
+            # 新任务可能比当前等待的任务更早到期，唤醒调度线程重新计算等待时间
+            self._cond.notify()
+        return job
+
+    def schedule_after(self, delay: float, func: Callable, *args, **kwargs) -> ScheduledJob:
+        """在 delay 秒后执行任务"""
+        return self.schedule_at(time.monotonic() + delay, func, *args, **kwargs)
+
+    def cancel(self, job: ScheduledJob) -> bool:
+        """取消尚未执行的任务，任务已执行或已取消时返回 False"""
+        with self._cond:
+            if job.cancelled or job.done:
+                return False
+            job.cancelled = True
+            self._pending -= 1
+            return True
+
+    def pending(self) -> int:
+        """尚未执行且未取消的任务数"""
+        with self._cond:
+            return self._pending
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    while self._heap and self._heap[0][2].cancelled:
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    delay = self._heap[0][0] - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                _, _, job = heapq.heappop(self._heap)
+                job.done = True
+                self._pending -= 1
+            self._executor.submit(self._execute, job)
+
+    @staticmethod
+    def _execute(job: ScheduledJob) -> Any:
+        try:
+            return job.func(*job.args, **job.kwargs)
+        except Exception as e:
+            logger.error(f"定时任务 {job.name} 执行失败: {str(e)}", exc_info=True)
+
+# 全局调度器
+scheduler = Scheduler(max_workers=config.get('scheduler_workers', 4))
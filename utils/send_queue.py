@@ -0,0 +1,272 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import IntEnum
+from typing import Any, Dict, List, Optional, Union
+import requests
+from urllib3.exceptions import NewConnectionError
+from extensions import logger, config
+from http_requests.onebot_action import call_action
+
+class MessagePriority(IntEnum):
+    """数值越小越先发送"""
+    HIGH = 0    # 管理员通知
+    NORMAL = 1  # 命令回复、欢迎语
+    LOW = 2     # 刷屏类消息
+
+class _OutboundMessage:
+    __slots__ = ('group_id', 'message', 'auto_escape', 'priority', 'coalesce',
+                 'enqueued_at', 'ready_at', 'attempts', 'futures')
+
+    def __init__(self, group_id: int, message: Union[str, list], auto_escape: bool,
+                 priority: MessagePriority, coalesce: bool):
+        self.group_id = group_id
+        self.message = message
+        self.auto_escape = auto_escape
+        self.priority = priority
+        self.coalesce = coalesce
+        self.enqueued_at = time.monotonic()
+        self.ready_at = self.enqueued_at
+        self.attempts = 0
+        self.futures: List[Future] = [Future()]
+
+    def can_merge(self, other: "_OutboundMessage") -> bool:
+        return (
+            self.coalesce and other.coalesce
+            and self.priority == other.priority
+            and self.auto_escape == other.auto_escape
+            and type(self.message) is type(other.message)
+            and isinstance(self.message, (str, list))
+        )
+
+    def merge(self, other: "_OutboundMessage") -> None:
+        if isinstance(self.message, str):
+            self.message = f"{self.message}\n{other.message}"
+        else:
+            self.message = self.message + [{"type": "text", "data": {"text": "\n"}}] + other.message
+        self.enqueued_at = min(self.enqueued_at, other.enqueued_at)
+        self.futures.extend(other.futures)
+
+class OutboundQueue:
+    """
+    群消息发送队列
+
+    - 全局每秒最多发送 global_rate 条，同一个群两条消息之间至少间隔 group_interval 秒
+    - 按优先级发送，同优先级先进先出
+    - 标记为 coalesce 的短文本在排队期间会与同群同优先级的后续消息合并为一条
+    - 只有能确认消息没有发出的失败(连接被拒绝、建立连接超时)按指数退避重试；
+      读取超时等无法确认是否已送达的失败记录日志后放弃，避免重复发送
+
+    调度线程按速率选出消息后交给发送线程池，网络请求不占用调度线程，一个群的慢请求不会阻塞其他群；
+    同一个群同一时间只有一条消息在发送，保证群内顺序。调用方拿到 Future，可选择等待发送结果
+    """
+
+    def __init__(self, global_rate: float = 5, group_interval: float = 1.0, max_retries: int = 3,
+                 retry_backoff: float = 1.0, coalesce_max_chars: int = 1500, max_workers: int = 4):
+        if not global_rate or global_rate <= 0:
+            raise ValueError(f"global_rate 必须大于 0: {global_rate}")
+        self.global_rate = global_rate
+        self.group_interval = group_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.coalesce_max_chars = coalesce_max_chars
+        self.max_workers = max(1, max_workers)
+        # 每个群一个堆: (优先级, 序号, 消息)
+        self._groups: Dict[int, list] = {}
+        self._group_next: Dict[int, float] = {}
+        self._global_next = 0.0
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+        # 正在发送消息的群，发送完成前不再选出该群的下一条消息
+        self._sending_groups = set()
+        self._stats = {'sent': 0, 'failed': 0, 'retried': 0, 'coalesced': 0,
+                       'latency_total': 0.0, 'latency_max': 0.0}
+
+    def enqueue(self, group_id: int, message: Union[str, list], auto_escape: bool = False,
+                priority: MessagePriority = MessagePriority.NORMAL, coalesce: bool = False) -> Future:
+        """
+        将群消息加入发送队列
+
+        Args:
+            group_id: 群号
+            message: 消息内容
+            auto_escape: 消息内容是否作为纯文本发送
+            priority: 发送优先级
+            coalesce: 是否允许与同群的其他短消息合并
+
+        Returns:
+            Future: 发送完成后得到 OneBot 响应
+        """
+        item = _OutboundMessage(int(group_id), message, auto_escape, priority, coalesce)
+        with self._cond:
+            self._ensure_started()
+            self._push(item)
+            self._cond.notify_all()
+        return item.futures[0]
+
+    def _push(self, item: _OutboundMessage) -> None:
+        heapq.heappush(self._groups.setdefault(item.group_id, []), (item.priority, next(self._counter), item))
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='send-queue-worker')
+            self._thread = threading.Thread(target=self._run, name='send-queue', daemon=True)
+            self._thread.start()
+
+    def _next_ready(self, now: float):
+        """
+        选出当前可发送的消息，返回 (消息, None)；没有可发送的消息时返回 (None, 最早可发送时间)
+        """
+        best = None
+        wake_at = None
+        for group_id, heap in self._groups.items():
+            # 该群有消息在发送时，发送完成会唤醒调度线程
+            if not heap or group_id in self._sending_groups:
+                continue
+            priority, seq, item = heap[0]
+            ready_at = max(item.ready_at, self._group_next.get(group_id, 0.0))
+            if ready_at > now:
+                wake_at = ready_at if wake_at is None else min(wake_at, ready_at)
+                continue
+            if best is None or (priority, seq) < best[:2]:
+                best = (priority, seq, group_id)
+        if best is None:
+            return None, wake_at
+
+        heap = self._groups[best[2]]
+        _, _, item = heapq.heappop(heap)
+        self._coalesce(item, heap, now)
+        if not heap:
+            del self._groups[best[2]]
+        return item, None
+
+    def _coalesce(self, item: _OutboundMessage, heap: list, now: float) -> None:
+        while heap and item.can_merge(heap[0][2]) and heap[0][2].ready_at <= now:
+            if len(str(item.message)) + len(str(heap[0][2].message)) > self.coalesce_max_chars:
+                break
+            _, _, other = heapq.heappop(heap)
+            item.merge(other)
+            self._stats['coalesced'] += 1
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    if self._in_flight >= self.max_workers:
+                        self._cond.wait()
+                        continue
+                    if self._global_next > now:
+                        self._cond.wait(self._global_next - now)
+                        continue
+                    item, wake_at = self._next_ready(now)
+                    if item is not None:
+                        break
+                    self._cond.wait(None if wake_at is None else wake_at - now)
+                # 速率名额在交给发送线程前就已记账，调度线程不等待网络请求
+                self._global_next = now + 1.0 / self.global_rate
+                self._group_next[item.group_id] = now + self.group_interval
+                self._sending_groups.add(item.group_id)
+                self._in_flight += 1
+            self._executor.submit(self._send_and_release, item)
+
+    def _send_and_release(self, item: _OutboundMessage) -> None:
+        try:
+            self._send(item)
+        except Exception as e:
+            logger.error(f"发送群 {item.group_id} 消息时发生错误: {str(e)}", exc_info=True)
+        finally:
+            with self._cond:
+                self._sending_groups.discard(item.group_id)
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    @staticmethod
+    def _not_delivered(error: Exception) -> bool:
+        """请求是否确定没有到达 OneBot: 连接未能建立时才能确定"""
+        if isinstance(error, requests.ConnectTimeout):
+            return True
+        if isinstance(error, requests.ConnectionError) and error.args:
+            return isinstance(getattr(error.args[0], 'reason', None), NewConnectionError)
+        return False
+
+    def _send(self, item: _OutboundMessage) -> None:
+        item.attempts += 1
+        retryable = False
+        try:
+            response = call_action('send_group_msg', {
+                "group_id": item.group_id,
+                "message": item.message,
+                "auto_escape": item.auto_escape
+            })
+        except Exception as e:
+            retryable = self._not_delivered(e)
+            response = {"status": "failed", "message": str(e)}
+
+        ok = response.get("status") == "ok"
+        if retryable and item.attempts <= self.max_retries:
+            delay = self.retry_backoff * 2 ** (item.attempts - 1)
+            logger.warning(
+                f"发送群 {item.group_id} 消息失败，{delay:.1f}s 后第 {item.attempts} 次重试: {response.get('message')}"
+            )
+            with self._cond:
+                item.ready_at = time.monotonic() + delay
+                self._push(item)
+                self._stats['retried'] += 1
+            return
+
+        latency = time.monotonic() - item.enqueued_at
+        with self._cond:
+            self._stats['sent' if ok else 'failed'] += 1
+            self._stats['latency_total'] += latency
+            self._stats['latency_max'] = max(self._stats['latency_max'], latency)
+        if not ok:
+            logger.error(f"发送群 {item.group_id} 消息失败，已放弃: {response.get('message')}")
+        for future in item.futures:
+            future.set_result(response)
+
+    def depth(self) -> int:
+        with self._cond:
+            return sum(len(heap) for heap in self._groups.values())
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """等待队列中的消息全部发送完毕，超时返回 False"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._groups or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            finished = self._stats['sent'] + self._stats['failed']
+            return {
+                'depth': sum(len(heap) for heap in self._groups.values()),
+                'sent': self._stats['sent'],
+                'failed': self._stats['failed'],
+                'retried': self._stats['retried'],
+                'coalesced': self._stats['coalesced'],
+                'avg_latency_ms': round(self._stats['latency_total'] / finished * 1000, 2) if finished else 0.0,
+                'max_latency_ms': round(self._stats['latency_max'] * 1000, 2)
+            }
+
+send_queue = OutboundQueue(
+    global_rate=config.get('send_global_rate', 5),
+    group_interval=config.get('send_group_interval', 1.0),
+    max_retries=config.get('send_max_retries', 3),
+    retry_backoff=config.get('send_retry_backoff', 1.0),
+    max_workers=config.get('send_workers', 4)
+)
+
+def queue_group_msg(group_id: int, message: Union[str, list], auto_escape: bool = False,
+                    priority: MessagePriority = MessagePriority.NORMAL, coalesce: bool = False) -> Future:
+    """通过全局发送队列发送群消息"""
+    return send_queue.enqueue(group_id, message, auto_escape, priority, coalesce)
@@ -1,16 +1,15 @@
-from http_requests.get_group_member_list import get_group_member_list
 from extensions import config, logger
-from http_requests.get_group_system_msg import get_group_system_msg
+from http_requests.async_onebot_action import fan_out, async_get_group_system_msg
 from events.request import handle_group_request
 
 def process_join_requests():
     """处理待处理的加群请求"""
     logger.info('Processing join requests...')
     
-    # 获取所有群的系统消息
-    for group_id in config['group_ids']:
+    # 并发获取所有群的系统消息
+    responses = fan_out(async_get_group_system_msg, config['group_ids'])
+    for group_id, response in responses.items():
         try:
-            response = get_group_system_msg(group_id)
             if response.get('status') != 'ok' or 'data' not in response:
                 continue
                 
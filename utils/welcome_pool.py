@@ -0,0 +1,119 @@
+import random
+import threading
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Set
+from extensions import logger, config
+from llm.gemini import get_gemini_api
+from llm.loop import get_llm_loop
+from llm.pool import execute_request
+
+DEFAULT_WELCOME_PROMPT = "生成一段对一位新人的欢迎加群语，内容包含：\n群公告获取整合，仔细看完所有公告，注意群规，违反立刻踢掉"
+
+DEFAULT_FALLBACK_TEMPLATES = [
+    "欢迎新人入群！请先查看群公告获取整合，仔细看完所有公告，注意群规，违反立刻踢掉。",
+    "欢迎加入！整合在群公告里，所有公告务必看完，遵守群规，违规直接踢出。",
+    "欢迎欢迎！请第一时间阅读群公告并获取整合，群规请牢记，违反立刻踢掉。",
+]
+
+class WelcomePool:
+    """
+    新人欢迎语池
+
+    每个群预先生成一批欢迎语，取用时直接出队，余量低于水位时在 LLM 事件循环中后台补充；
+    新生成的文本会与池中及最近用过的欢迎语去重，池为空时使用静态模板兜底
+    """
+
+    def __init__(self, target_size: int = 5, low_watermark: int = 2, history_size: int = 20):
+        self.target_size = target_size
+        self.low_watermark = low_watermark
+        self.history_size = history_size
+        self._pools: Dict[int, Deque[str]] = {}
+        self._recent: Dict[int, Deque[str]] = {}
+        self._refilling: Set[int] = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return ''.join(text.split())
+
+    def _fallback(self, group_id: int) -> str:
+        templates = config.get('welcome_fallback_templates') or DEFAULT_FALLBACK_TEMPLATES
+        recent = self._recent.get(group_id, ())
+        candidates = [text for text in templates if text not in recent] or templates
+        return random.choice(candidates)
+
+    def pop(self, group_id: int) -> str:
+        """取出一条欢迎语，必要时触发后台补充"""
+        with self._lock:
+            pool = self._pools.setdefault(group_id, deque())
+            text = pool.popleft() if pool else None
+            if text is None:
+                text = self._fallback(group_id)
+                logger.info(f"群 {group_id} 欢迎语池为空，使用静态模板")
+            self._recent.setdefault(group_id, deque(maxlen=self.history_size)).append(text)
+            need_refill = len(pool) < self.low_watermark
+        if need_refill:
+            self.refill(group_id)
+        return text
+
+    def size(self, group_id: int) -> int:
+        with self._lock:
+            return len(self._pools.get(group_id, ()))
+
+    def refill(self, group_id: int) -> bool:
+        """在后台补充指定群的欢迎语，已在补充中时返回 False"""
+        with self._lock:
+            if group_id in self._refilling:
+                return False
+            self._refilling.add(group_id)
+        get_llm_loop().submit(self._refill(group_id))
+        return True
+
+    def prefill(self, group_ids: Iterable[int]) -> None:
+        """为多个群预生成欢迎语"""
+        for group_id in group_ids:
+            self.refill(int(group_id))
+
+    async def _generate(self, count: int) -> List[str]:
+        """一次请求生成 count 条风格各异的欢迎语"""
+        prompt = config.get('welcome_prompt', DEFAULT_WELCOME_PROMPT)
+        prompt += f"\n\n请一次生成 {count} 条措辞和风格各不相同的欢迎语"
+        schema = {
+            "type": "object",
+            "properties": {
+                "messages": {"type": "array", "items": {"type": "string"}}
+            },
+            "required": ["messages"]
+        }
+        api = get_gemini_api()
+        result = await execute_request(api.achat_json, prompt, schema, use_cache=False)
+        return [text.strip() for text in result.get("messages", []) if isinstance(text, str) and text.strip()]
+
+    async def _refill(self, group_id: int) -> None:
+        try:
+            with self._lock:
+                missing = self.target_size - len(self._pools.get(group_id, ()))
+            if missing <= 0:
+                return
+            texts = await self._generate(missing)
+            with self._lock:
+                pool = self._pools.setdefault(group_id, deque())
+                seen = {self._normalize(text) for text in pool}
+                seen.update(self._normalize(text) for text in self._recent.get(group_id, ()))
+                for text in texts:
+                    key = self._normalize(text)
+                    if key in seen or len(pool) >= self.target_size:
+                        continue
+                    seen.add(key)
+                    pool.append(text)
+                logger.info(f"群 {group_id} 欢迎语池已补充至 {len(pool)} 条")
+        except Exception as e:
+            logger.error(f"补充群 {group_id} 欢迎语失败: {str(e)}")
+        finally:
+            with self._lock:
+                self._refilling.discard(group_id)
+
+welcome_pool = WelcomePool(
+    target_size=config.get('welcome_pool_size', 5),
+    low_watermark=config.get('welcome_pool_low_watermark', 2)
+)